@@ -0,0 +1,65 @@
+# Per-frame cost of the four-way superposition blend.
+#
+#   python benchmarks/bench_blend.py [--width 3840 --height 2160 --frames 30]
+#
+# Compares the original float32 sum()/clip/astype path from video-superpose.py
+# with qtqc.blend.Blender, and reports bytes allocated per blended frame.
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.blend import Blender
+
+
+def float_blend(frames):
+    blended = sum(frame.astype(np.float32) for frame in frames) / 4.0
+    return np.clip(blended, 0, 255).astype(np.uint8)
+
+
+def float_transition(frames, collapsed, alpha):
+    blended = float_blend(frames).astype(np.float32)
+    frame = (1 - alpha) * blended + alpha * collapsed.astype(np.float32)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def measure(fn, repeats):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    ms = (time.perf_counter() - start) / repeats * 1000
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ms, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark superposition blending")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.height, args.width, 3)
+    frames = [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(5)]
+    sources, collapsed = frames[:4], frames[4]
+    blender = Blender(shape)
+
+    cases = {
+        "float equal": lambda: float_blend(sources),
+        "Blender equal": lambda: blender.equal(sources),
+        "float transition": lambda: float_transition(sources, collapsed, 0.3),
+        "Blender transition": lambda: blender.blend(sources + [collapsed], [0.7 / 4] * 4 + [0.3]),
+    }
+    print(f"{args.width}x{args.height}, {args.frames} frames each")
+    for name, fn in cases.items():
+        ms, peak = measure(fn, args.frames)
+        print(f"{name:>20}: {ms:7.2f} ms/frame, {peak / 1e6:8.1f} MB allocated")
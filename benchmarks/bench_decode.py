@@ -0,0 +1,56 @@
+# Decoding per-shot memory into (zoom, video) fields.
+#
+#   python benchmarks/bench_decode.py [--shots 1000000]
+#
+# Compares the original per-bitstring loop (reverse, int() per character)
+# with qtqc.decode on the same Aer-style memory strings, and checks that both
+# give the same values. Also times decoding from an unpacked bit array and a
+# packed BitArray-style buffer, which skip string handling entirely.
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.decode import Layout, unpack
+
+LAYOUT = "zoom = q0..q3, video = q4..q5"
+
+
+def decode_loop(memory):
+    out = []
+    for bitstring in memory:
+        bits = list(reversed(bitstring))
+        zoom_raw = sum(int(bits[i]) << i for i in range(4))
+        video = sum(int(bits[4 + i]) << i for i in range(2))
+        out.append((zoom_raw, video))
+    return out
+
+
+def timed(label, fn, shots):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:28s} {elapsed * 1e3:9.1f} ms  {shots / elapsed / 1e6:7.2f} M shots/s")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, (args.shots, 6), dtype=np.uint8)
+    memory = ["".join(map(str, row[::-1])) for row in bits.tolist()]
+    packed = np.packbits(bits[:, ::-1], axis=1)  # qiskit BitArray layout
+    layout = Layout(LAYOUT)
+
+    loop = timed("per-bitstring loop", lambda: decode_loop(memory), args.shots)
+    fields = timed("layout, memory strings", lambda: layout.decode(memory), args.shots)
+    timed("layout, bit array", lambda: layout.decode(bits), args.shots)
+    timed("layout, packed", lambda: layout.decode(unpack(packed, 6)), args.shots)
+    timed("layout + tolist()", lambda: layout.decode(memory).tolist(), args.shots)
+    assert fields.tolist() == loop
@@ -0,0 +1,74 @@
+# Bits consumed per choice: rejection loop vs. modulo vs. UniformDecoder.
+#
+#   python benchmarks/bench_dice.py [--draws N]
+#
+# Uses a classical bit stream so the numbers only reflect the decoding
+# scheme; every measured bit from the simulator costs the same.
+import argparse
+import math
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.dice import UniformDecoder
+
+
+def random_bits():
+    while True:
+        yield random.getrandbits(1)
+
+
+def rejection(n, draws):
+    """The choose-video.py loop: draw ceil(log2 n) bits, retry when >= n."""
+    width = max(1, math.ceil(math.log2(n)))
+    bits = random_bits()
+    used = 0
+    counts = Counter()
+    for _ in range(draws):
+        while True:
+            value = sum(next(bits) << i for i in range(width))
+            used += width
+            if value < n:
+                counts[value] += 1
+                break
+    return used / draws, counts
+
+
+def modulo(n, draws, width=3):
+    """The lsystem.py pattern: int(bitstring, 2) % n on a fixed-width draw."""
+    bits = random_bits()
+    counts = Counter()
+    for _ in range(draws):
+        counts[sum(next(bits) << i for i in range(width)) % n] += 1
+    return float(width), counts
+
+
+def decoder(n, draws):
+    d = UniformDecoder(random_bits())
+    counts = Counter(d.randrange(n) for _ in range(draws))
+    return d.bits_per_draw(), counts
+
+
+def spread(counts, n, draws):
+    """Largest relative deviation from the uniform expectation."""
+    expected = draws / n
+    return max(abs(counts[k] - expected) for k in range(n)) / expected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare bits consumed per uniform choice")
+    parser.add_argument("--draws", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'n':>4} {'ideal':>7} {'reject':>7} {'modulo':>7} {'decoder':>8}  max deviation (reject / modulo / decoder)")
+    for n in (3, 5, 6, 12, 100):
+        r_bits, r_counts = rejection(n, args.draws)
+        m_bits, m_counts = modulo(n, args.draws, width=max(3, math.ceil(math.log2(n))))
+        d_bits, d_counts = decoder(n, args.draws)
+        print(
+            f"{n:>4} {math.log2(n):7.3f} {r_bits:7.3f} {m_bits:7.3f} {d_bits:8.3f}  "
+            f"{spread(r_counts, n, args.draws):.3f} / {spread(m_counts, n, args.draws):.3f} / "
+            f"{spread(d_counts, n, args.draws):.3f}"
+        )
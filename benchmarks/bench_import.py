@@ -0,0 +1,64 @@
+# Start-up cost of the entry-point scripts and the heavy imports behind them.
+#
+#   python benchmarks/bench_import.py [--top 8] [--runs 3]
+#
+# Each target runs in a fresh interpreter with -X importtime. The report
+# gives total import time, wall time and the slowest top-level imports, so a
+# script that starts pulling in qiskit or matplotlib again shows up here.
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SANDBOX = os.path.join(ROOT, "sandbox")
+
+MODULES = ["numpy", "qtqc", "qtqc.lite", "qtqc.backends", "qiskit", "qiskit_aer", "matplotlib.pyplot", "cv2"]
+SCRIPTS = ["simple_prompt.py", "bit_collapse.py", "prompt_tree_qiskit.py"]
+
+
+def import_times(stderr):
+    """{top-level module: cumulative microseconds} from -X importtime output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith(" " * 2):  # nested imports are indented
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(args, runs):
+    """Best-of-runs (wall seconds, import times) for one interpreter invocation."""
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONPATH=ROOT)
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=SANDBOX, env=env,
+                              capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.splitlines()[-1])
+        if best is None or wall < best[0]:
+            best = wall, import_times(proc.stderr)
+    return best
+
+
+def report(label, wall, times, top):
+    heavy = sorted(times.items(), key=lambda item: -item[1])[:top]
+    print(f"{label:28s} wall {wall:6.2f} s  imports {sum(times.values()) / 1e6:6.2f} s")
+    print("    " + ", ".join(f"{name} {us / 1e3:.0f} ms" for name, us in heavy))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per target")
+    parser.add_argument("--runs", type=int, default=3, help="best of this many cold starts")
+    args = parser.parse_args()
+
+    for module in MODULES:
+        report(f"import {module}", *measure(["-c", f"import {module}"], args.runs), args.top)
+    for script in SCRIPTS:
+        report(script, *measure([script], args.runs), args.top)
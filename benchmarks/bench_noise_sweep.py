@@ -0,0 +1,64 @@
+# T1/T2 grid sweep: one transpile + run per setting vs qtqc.noise_sweep.
+#
+#   python benchmarks/bench_noise_sweep.py [--points 12 --shots 2000 --workers 4]
+#
+# The per-setting loop is what the temp-*.py scripts did: build a NoiseModel,
+# transpile and run once for every (T1, T2). The sweep transpiles once and
+# runs the whole grid as batched jobs, or skips shots entirely with the
+# exact product-circuit path.
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit_aer import AerSimulator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.noise_sweep import grid, sweep, thermal_noise_model
+
+
+def test_circuit():
+    qc = QuantumCircuit(3, 3)
+    qc.h([0, 1, 2])
+    qc.barrier()
+    qc.id([0, 1, 2])
+    qc.measure([0, 1, 2], [0, 1, 2])
+    return qc
+
+
+def per_setting(qc, points, shots):
+    backend = AerSimulator()
+    for T1, T2, gate_time in points:
+        tqc = transpile(qc, backend, optimization_level=0)
+        backend.run(tqc, noise_model=thermal_noise_model(T1, T2, gate_time), shots=shots).result()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=12, help="T1 and T2 values per axis")
+    parser.add_argument("--shots", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    qc = test_circuit()
+    times = np.geomspace(1e-6, 100e-6, args.points)
+    points = grid(times, times)
+    print(f"{len(points)} settings, {args.shots} shots each")
+
+    start = time.perf_counter()
+    per_setting(qc, points, args.shots)
+    print(f"per-setting loop   {time.perf_counter() - start:7.2f} s")
+
+    start = time.perf_counter()
+    sweep(qc, points, shots=args.shots, exact=False)
+    print(f"batched sweep      {time.perf_counter() - start:7.2f} s")
+
+    start = time.perf_counter()
+    sweep(qc, points, shots=args.shots, workers=args.workers, batch_size=-(-len(points) // args.workers), exact=False)
+    print(f"sweep, {args.workers} workers  {time.perf_counter() - start:7.2f} s")
+
+    start = time.perf_counter()
+    sweep(qc, points)
+    print(f"exact sweep        {time.perf_counter() - start:7.4f} s")
@@ -0,0 +1,65 @@
+# Sampling large Clifford prompt graphs.
+#
+#   python benchmarks/bench_stabilizer.py [--nodes 50 200] [--k 2] [--shots 1000]
+#
+# Builds prompt graphs of N nodes with k qubits each (random sparse concept
+# edges) in two forms: H then CZ (qtqc.lite's uniform path), and a CX-built
+# GHZ spine with CZ along the same edges (qtqc.stabilizer's tableau). Both
+# are timed against Aer's stabilizer method. Statevector needs 2^(N*k)
+# amplitudes and stops being an option at about 30 qubits.
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.lite import Circuit, sample_array, superposed_qubits
+from qtqc.stabilizer import outcome_map
+
+
+def concept_graph(num_nodes, k, degree, rng):
+    n = num_nodes * k
+    edges = {tuple(sorted(rng.choice(num_nodes, 2, replace=False))) for _ in range(num_nodes * degree // 2)}
+    graph = Circuit(n, n).h(range(n))
+    for a, b in sorted(edges):
+        for j in range(k):
+            graph.cz(a * k + j, b * k + j)
+    graph.measure(range(n), range(n))
+
+    ghz = Circuit(n, n).h(0)
+    for q in range(n - 1):
+        ghz.cx(q, q + 1)
+    for a, b in sorted(edges):
+        ghz.cz(a * k, b * k)
+    ghz.measure(range(n), range(n))
+    return graph, ghz
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--k", type=int, default=2, help="qubits per node")
+    parser.add_argument("--degree", type=int, default=3, help="average concept edges per node")
+    parser.add_argument("--shots", type=int, default=1000)
+    args = parser.parse_args()
+
+    from qtqc.backends import get_backend
+    aer = get_backend("stabilizer")
+    rng = np.random.default_rng(0)
+    print(f"{'qubits':>7s} {'circuit':>8s} {'route':>9s} {'lite':>9s} {'aer stab':>9s}")
+    for num_nodes in args.nodes:
+        for label, qc in zip(("H+CZ", "GHZ+CZ"), concept_graph(num_nodes, args.k, args.degree, rng)):
+            route = "uniform" if superposed_qubits(qc) is not None else "tableau"
+            assert route == "uniform" or outcome_map(qc) is not None
+            lite = timed(lambda: sample_array(qc, args.shots, rng))
+            qiskit_qc = qc.to_qiskit()
+            stab = timed(lambda: aer.run(qiskit_qc, shots=args.shots, memory=True).result())
+            print(f"{qc.num_qubits:7d} {label:>8s} {route:>9s} {lite * 1e3:7.1f}ms {stab * 1e3:7.1f}ms")
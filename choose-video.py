@@ -1,9 +1,21 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
+import argparse
 import json
+import os
+import socket
+import socketserver
+import threading
 
-# --- Circuit: 6 qubits -> [q0..q3]=zoom bits, [q4..q5]=video bits ---
+from qtqc.dice import UniformDecoder
+from qtqc.sockets import remove_stale_socket
+
+# qiskit is imported inside the functions that need it so the thin client
+# (--client, or the default path when a server is running) starts instantly.
+
+DEFAULT_SOCKET = "/tmp/choose-video.sock"
+
+# --- Circuit: 6 uniform qubits per shot, all feeding the exact-uniform decoder ---
 def selection_circuit():
+    from qiskit import QuantumCircuit
     qc = QuantumCircuit(6, 6)
     # Put all 6 qubits into uniform superposition
     for i in range(6):
@@ -12,30 +24,117 @@ def selection_circuit():
     qc.measure([0,1,2,3,4,5], [0,1,2,3,4,5])
     return qc
 
-def sample_once(qc):
-    """Run one shot and decode (zoom_raw 0..15, video 0..3)."""
-    backend = Aer.get_backend('qasm_simulator')
-    tqc = transpile(qc, backend)
-    result = backend.run(tqc, shots=1).result()
-    bitstring = list(result.get_counts().keys())[0]  # e.g., '100101'
-    bits = list(reversed(bitstring))  # index i now corresponds to qubit i
-
-    # zoom = bits q0..q3 (little-endian)
-    zoom_raw = sum(int(bits[i]) << i for i in range(4))
-    # video = bits q4..q5 (little-endian)
-    video = sum(int(bits[4 + i]) << i for i in range(2))
-    return zoom_raw, video
-
-def sample_zoom_video():
-    """Rejection-sample so zoom is uniform over 0..11."""
-    qc = selection_circuit()
-    while True:
-        zoom_raw, video = sample_once(qc)
-        if zoom_raw < 12:
-            return {
-                "zoom":  {"value": zoom_raw},
-                "video": {"value": video}
-            }
+# --- Entropy pool: one multi-shot job, served one bit at a time ---
+class EntropyPool:
+    """Measured bits from one multi-shot run of the circuit, fed straight into the decoder."""
+
+    def __init__(self, qc, shots=4096):
+        from qiskit import transpile
+        from qtqc.backends import get_backend
+        from qtqc.sampling import BitBlock, stream_bits
+        self.backend = get_backend('ideal')
+        self.tqc = transpile(qc, self.backend)  # transpile once, reuse for every run
+        self.width = qc.num_clbits
+        # The first job runs here, so a server pays for it before accepting clients
+        block = BitBlock(size=shots * self.width, bit_source=self.run)
+        self.decoder = UniformDecoder(stream_bits(block, chunk=block.size))
+
+    def run(self, num_bits):
+        """bit_source: num_bits from one multi-shot run, qubit 0 first within each shot."""
+        from qtqc.sampling import memory_to_bits
+        shots = -(-num_bits // self.width)
+        result = self.backend.run(self.tqc, shots=shots, memory=True).result()
+        return memory_to_bits(result.get_memory()).reshape(-1)[:num_bits]
+
+class SourcePool:
+    """EntropyPool stand-in drawing from a qtqc.entropy source instead of the circuit."""
+
+    def __init__(self, source, chunk=64):
+        from qtqc.sampling import stream_bits
+        self.source = source
+        self.decoder = UniformDecoder(stream_bits(source, chunk=chunk))
+
+_pool = None
+
+def get_pool(shots=4096, entropy=None, harvest=False):
+    """The shared pool: the 6-qubit circuit, or the named entropy source (QTQC_ENTROPY by default)."""
+    global _pool
+    if _pool is None:
+        entropy = entropy or os.environ.get("QTQC_ENTROPY")
+        if entropy:
+            from qtqc.entropy import HarvestedPool, chunk_bits, entropy_source
+            source = entropy_source(entropy)
+            chunk = chunk_bits(entropy)  # one simulator run per fill, a few bits at a time from a counter
+            # A long-running server harvests ahead so slow sources never stall a request
+            _pool = SourcePool(HarvestedPool(source, chunk=chunk) if harvest else source, chunk)
+        else:
+            _pool = EntropyPool(selection_circuit(), shots=shots)
+    return _pool
+
+def sample_zoom_video(pool=None):
+    """Exact-uniform zoom over 0..11 and video over 0..3, with no rejected bits."""
+    pool = pool or get_pool()
+    return {
+        "zoom":  {"value": pool.decoder.randrange(12)},
+        "video": {"value": pool.decoder.randrange(4)}
+    }
+
+# --- Server mode: keep the backend, transpiled circuit and pool warm ---
+class SelectionHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if line.strip() != b"sample":
+                self.wfile.write(b'{"error": "unknown request"}\n')
+                continue
+            with self.server.lock:
+                selection = sample_zoom_video(self.server.pool)
+            self.wfile.write(json.dumps(selection).encode() + b"\n")
+
+class SelectionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, shots=4096, entropy=None):
+        remove_stale_socket(path)
+        super().__init__(path, SelectionHandler)
+        self.pool = get_pool(shots, entropy, harvest=True)  # first job runs before clients connect
+        self.lock = threading.Lock()
+
+def serve(path=DEFAULT_SOCKET, shots=4096, entropy=None):
+    with SelectionServer(path, shots, entropy) as server:
+        print(f"choose-video serving on {path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+def request_selection(path=DEFAULT_SOCKET, timeout=2.0):
+    """Ask a running server for one selection; returns the decoded JSON dict."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(b"sample\n")
+        reply = sock.makefile("rb").readline()
+    return json.loads(reply)
+
 if __name__ == "__main__":
-    selection = sample_zoom_video()
-    print(json.dumps(selection))
+    parser = argparse.ArgumentParser(description="Quantum zoom/video selection")
+    parser.add_argument("--serve", action="store_true", help="run as a persistent selection server")
+    parser.add_argument("--client", action="store_true", help="only ask a running server, never sample locally")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--shots", type=int, default=4096, help="shots per entropy pool refill")
+    parser.add_argument("--entropy", help="qtqc.entropy source instead of the circuit, e.g. gmc+von_neumann")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.socket, args.shots, args.entropy)
+    elif args.client:
+        print(json.dumps(request_selection(args.socket)))
+    else:
+        # Use a warm server when one is running, otherwise fall back to a cold local run
+        try:
+            selection = request_selection(args.socket)
+        except (OSError, ValueError):  # no server, or it closed mid-reply
+            selection = sample_zoom_video(get_pool(args.shots, args.entropy))
+        print(json.dumps(selection))
@@ -19,22 +19,58 @@
 # print(df)
 
 
-import pygmc
-import time, sys
+import argparse
+import asyncio
+import os
+import sys
 
-gc = pygmc.connect()  # Connect to the Geiger counter
-last_cps = None
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.geiger import AcquisitionError, FakeGMC, GeigerService, subscribe_socket
 
-time.sleep(1)  # Allow time for the connection to stabilize
 
-while True:
-    current_cps = gc.get_cps()
-    # if current_cps != last_cps and current_cps > 0:
-    if current_cps > 0:
-        # print(f"New count registered: {current_cps} CPS")
-        for i in range(current_cps):
-            print("+", end=" ")
+def show(reading):
+    if reading.cps > 0:
+        print("+ " * reading.cps, end="")
         sys.stdout.flush()
-        last_cps = current_cps
-    time.sleep(1)  # Poll every 0.1 seconds for sub-second precision
-    # time.sleep(0.1)  # Poll every 0.1 seconds for sub-second precision
\ No newline at end of file
+
+
+async def acquire(args):
+    if args.fake:
+        gc = FakeGMC(rate=args.fake)
+    else:
+        import pygmc
+        gc = pygmc.connect()  # Connect to the Geiger counter
+        await asyncio.sleep(1)  # Allow time for the connection to stabilize
+
+    # Readings are timestamped and logged on the reader thread; printing
+    # here can block without losing counts
+    async with GeigerService(gc, interval=args.interval, log_path=args.log) as service:
+        server = await service.serve(args.socket) if args.socket else None
+        try:
+            async for reading in service.stream():
+                show(reading)
+        finally:
+            if server:
+                server.close()
+
+
+async def listen(path):
+    async for reading in subscribe_socket(path):
+        show(reading)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream timestamped Geiger counts")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between CPS polls")
+    parser.add_argument("--log", default="gmc-events.bin", help="append-only binary log ('' to disable)")
+    parser.add_argument("--socket", help="also serve readings on this Unix socket")
+    parser.add_argument("--client", metavar="SOCKET", help="print readings from a running service instead")
+    parser.add_argument("--fake", type=float, metavar="RATE", help="simulate a counter clicking at RATE per second")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(listen(args.client) if args.client else acquire(args))
+    except KeyboardInterrupt:
+        pass
+    except AcquisitionError as e:
+        sys.exit(f"gmc-events: {e}")
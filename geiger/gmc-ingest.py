@@ -0,0 +1,51 @@
+# Incremental GMC history ingestion, then CPM/CPS for a recent window.
+#
+#   python geiger/gmc-ingest.py [--store gmc-history] [--window 3600] [--bin 60]
+#
+# Only flash written since the previous run is read over serial; history is
+# kept as day-partitioned Parquet under --store (see qtqc/gmc_history.py).
+import argparse
+import datetime
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.gmc_history import HistoryStore
+
+
+def fake_device():
+    """FakeGMC with two days of per-minute history, for trying the tool without a counter."""
+    from qtqc.geiger import FakeGMC
+    gc = FakeGMC()
+    start = datetime.datetime.now().replace(second=0, microsecond=0) - datetime.timedelta(days=2)
+    gc.log_history(start, np.random.default_rng().poisson(25, 2 * 24 * 60).tolist())
+    return gc
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest new GMC history and summarize a recent window")
+    parser.add_argument("--store", default="gmc-history", help="dataset directory")
+    parser.add_argument("--format", default=".parquet", choices=[".parquet", ".feather", ".npz"])
+    parser.add_argument("--window", type=int, default=3600, help="seconds before the newest record to summarize")
+    parser.add_argument("--bin", type=int, default=60, help="aggregation bin in seconds")
+    parser.add_argument("--no-ingest", action="store_true", help="only query what is already stored")
+    parser.add_argument("--fake", action="store_true", help="use a simulated counter")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.store, ext=args.format)
+    if not args.no_ingest:
+        if args.fake:
+            gc = fake_device()
+        else:
+            import pygmc
+            gc = pygmc.connect()  # Connect to the Geiger counter
+        print(f"Ingested {store.ingest(gc)} new records")
+
+    if not store.state["last_datetime"]:
+        sys.exit("No history stored yet")
+    end = np.datetime64(store.state["last_datetime"], "s") + np.timedelta64(1, "s")
+    starts, cpm, cps = store.rates(end - np.timedelta64(args.window, "s"), end, args.bin)
+    for start, m, s in zip(starts, cpm, cps):
+        print(f"{start}  {m:8.1f} CPM  {s:7.2f} CPS")
@@ -0,0 +1,14 @@
+# Shared helpers for the quantum sandbox scripts.
+#
+# Submodules load on first attribute access (qtqc.backends, qtqc.lite, ...),
+# so importing the package itself pulls in nothing heavy.
+import importlib
+
+
+def __getattr__(name):
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
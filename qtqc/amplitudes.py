@@ -0,0 +1,87 @@
+# Blend weights from simulated amplitudes.
+#
+# The superposition blends weight each source by |amplitude|^2 of the
+# matching basis state, so the picture follows the actual quantum state
+# instead of a fixed 1/4 each. Sweeps evolve one statevector per parameter
+# value together, as a (values, 2**n) batch that every gate is applied to in
+# a single NumPy contraction, so a whole sweep costs one pass over the
+# circuit; playback then only indexes the precomputed probability table.
+import numpy as np
+
+
+def interference_circuit(theta=None):
+    """2 qubits, H-CP(theta)-H: |00> at theta=0, equal superposition at theta=pi."""
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import Parameter
+    theta = Parameter("θ") if theta is None else theta
+    qc = QuantumCircuit(2)
+    qc.h([0, 1])
+    qc.cp(theta, 0, 1)
+    qc.h([0, 1])
+    return qc
+
+
+def probabilities(circuit):
+    """Basis-state probabilities of a bound, measurement-free circuit (index i = bitstring format(i, 'b'))."""
+    from qiskit.quantum_info import Statevector
+    return Statevector(circuit).probabilities()
+
+
+def gate_matrices(op, parameter, values):
+    """(k, k) matrix of a fixed gate, or (len(values), k, k) for one that depends on parameter."""
+    from qiskit.circuit import ParameterExpression
+    if not any(isinstance(p, ParameterExpression) and p.parameters for p in op.params):
+        return op.to_matrix()
+    mats = []
+    for value in values:
+        bound = op.copy()
+        bound.params = [
+            float(p.bind({parameter: value})) if isinstance(p, ParameterExpression) else p
+            for p in op.params
+        ]
+        mats.append(bound.to_matrix())
+    return np.stack(mats)
+
+
+def sweep_probabilities(circuit, parameter, values):
+    """(len(values), 2**n) probabilities for every value of parameter, in one batched pass."""
+    values = np.asarray(values, dtype=float)
+    n = circuit.num_qubits
+    batch = len(values)
+    # Axis 0 is the sweep; axis 1 + (n - 1 - q) is qubit q (Qiskit little-endian)
+    state = np.zeros((batch,) + (2,) * n, dtype=complex)
+    state[(slice(None),) + (0,) * n] = 1.0
+    for inst in circuit.data:
+        op = inst.operation
+        if op.name == "barrier":
+            continue
+        if inst.clbits or not hasattr(op, "to_matrix"):
+            raise ValueError(f"sweep_probabilities needs a unitary circuit, found {op.name!r}")
+        qubits = [circuit.find_bit(q).index for q in inst.qubits]
+        m = len(qubits)
+        # Gate matrices index their qargs little-endian too, so the last axis is qargs[0]
+        axes = [1 + (n - 1 - q) for q in reversed(qubits)]
+        moved = np.moveaxis(state, axes, range(n + 1 - m, n + 1))
+        shape = moved.shape
+        flat = moved.reshape(batch, -1, 2 ** m)
+        mats = gate_matrices(op, parameter, values)
+        if mats.ndim == 3:
+            flat = np.einsum("brk,bjk->brj", flat, mats)
+        else:
+            flat = flat @ mats.T
+        state = np.moveaxis(flat.reshape(shape), range(n + 1 - m, n + 1), axes)
+    return (np.abs(state) ** 2).reshape(batch, -1)
+
+
+def weights_for(keys, probs):
+    """Order a probability vector by outcome keys such as '00', '01', '10', '11'."""
+    return [float(probs[int(k, 2)]) for k in keys]
+
+
+def sample_outcome(circuit, num_bits=None):
+    """Measure a bound circuit once and return the outcome bitstring."""
+    from qtqc.backends import get_backend
+    qc = circuit.measure_all(inplace=False)
+    result = get_backend("ideal").run(qc, shots=1).result()
+    bitstring = list(result.get_counts().keys())[0]
+    return bitstring[-num_bits:] if num_bits else bitstring
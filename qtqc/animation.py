@@ -0,0 +1,156 @@
+# Streaming animation export.
+#
+# Frames arrive one at a time as (image, duration_ms) pairs and are encoded
+# and written immediately, so an animation never sits in memory as a list
+# of frames. A hold is a single frame with a long duration rather than
+# many copies of it. GIF and APNG keep per-frame durations; MP4 has a fixed
+# frame rate, so holds are re-sent to the encoder (no copies are made).
+import struct
+import zlib
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+
+def as_image(frame):
+    return frame if isinstance(frame, Image.Image) else Image.fromarray(frame)
+
+
+def as_array(frame):
+    return np.asarray(frame)
+
+
+def shared_palette(images, colors=256):
+    """One P-mode palette image built from several frames, for GifWriter(palette=...)."""
+    stacked = np.concatenate([as_array(as_image(im).convert("RGB")) for im in images])
+    return Image.fromarray(stacked).quantize(colors)
+
+
+class GifWriter:
+    """GIF written frame by frame.
+
+    Without a palette every frame is quantized on its own and carries a local
+    color table; with one (see shared_palette) frames are only mapped onto it
+    and share the global table.
+    """
+
+    def __init__(self, path, loop=0, palette=None):
+        self.f = open(path, "wb")
+        self.loop = loop
+        self.palette = palette
+        self.started = False
+
+    def write(self, frame, duration):
+        frame = as_image(frame).convert("RGB")
+        if self.palette is None:
+            frame = frame.quantize(256)
+        else:
+            frame = frame.quantize(palette=self.palette, dither=Image.Dither.NONE)
+        if not self.started:
+            header, _ = GifImagePlugin.getheader(frame.copy(), info={"loop": self.loop})
+            self.f.write(b"".join(header))
+            self.started = True
+        for chunk in GifImagePlugin.getdata(frame, duration=duration, include_color_table=self.palette is None):
+            self.f.write(chunk)
+
+    def close(self):
+        self.f.write(b";")  # GIF trailer
+        self.f.close()
+
+
+def png_chunk(kind, data):
+    body = kind + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+
+class ApngWriter:
+    """Animated PNG written frame by frame; the frame count is patched in on close()."""
+
+    def __init__(self, path, loop=0):
+        self.f = open(path, "wb")
+        self.loop = loop
+        self.frames = 0
+        self.sequence = 0
+        self.actl_offset = None
+
+    def write(self, frame, duration):
+        pixels = as_array(frame)
+        height, width = pixels.shape[:2]
+        channels = pixels.shape[2] if pixels.ndim == 3 else 1
+        if self.actl_offset is None:
+            color_type = {1: 0, 3: 2, 4: 6}[channels]
+            self.f.write(b"\x89PNG\r\n\x1a\n")
+            self.f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)))
+            self.actl_offset = self.f.tell()
+            self.f.write(png_chunk(b"acTL", struct.pack(">II", 0, self.loop)))
+
+        self.f.write(png_chunk(b"fcTL", struct.pack(
+            ">IIIIIHHBB", self.sequence, width, height, 0, 0, int(duration), 1000, 0, 0
+        )))
+        self.sequence += 1
+
+        # Filter type 0 (None) in front of every scanline, then deflate
+        rows = np.empty((height, 1 + width * channels), dtype=np.uint8)
+        rows[:, 0] = 0
+        rows[:, 1:] = pixels.reshape(height, -1)
+        data = zlib.compress(rows.tobytes(), 6)
+        if self.frames == 0:
+            self.f.write(png_chunk(b"IDAT", data))
+        else:
+            self.f.write(png_chunk(b"fdAT", struct.pack(">I", self.sequence) + data))
+            self.sequence += 1
+        self.frames += 1
+
+    def close(self):
+        self.f.write(png_chunk(b"IEND", b""))
+        if self.actl_offset is not None:
+            self.f.seek(self.actl_offset)
+            self.f.write(png_chunk(b"acTL", struct.pack(">II", self.frames, self.loop)))
+        self.f.close()
+
+
+class Mp4Writer:
+    def __init__(self, path, frame_duration=100):
+        self.path = path
+        self.frame_duration = frame_duration
+        self.writer = None
+
+    def write(self, frame, duration):
+        import cv2
+        pixels = as_array(frame)
+        code = cv2.COLOR_RGBA2BGR if pixels.shape[2] == 4 else cv2.COLOR_RGB2BGR
+        bgr = cv2.cvtColor(pixels, code)
+        if self.writer is None:
+            fps = 1000 / self.frame_duration
+            self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*"mp4v"), fps, bgr.shape[1::-1])
+        for _ in range(max(1, round(duration / self.frame_duration))):
+            self.writer.write(bgr)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+
+
+def open_writer(path, frame_duration=100, loop=0, palette=None):
+    """Pick a streaming writer from the file extension (.gif, .png/.apng, .mp4)."""
+    ext = path.lower().rsplit(".", 1)[-1]
+    if ext == "gif":
+        return GifWriter(path, loop, palette)
+    if ext in ("png", "apng"):
+        return ApngWriter(path, loop)
+    if ext in ("mp4", "m4v", "mov"):
+        return Mp4Writer(path, frame_duration)
+    raise ValueError(f"unsupported animation format: {path}")
+
+
+def save_animation(path, frames, frame_duration=100, loop=0, palette=None):
+    """Encode (image, duration_ms) pairs from any iterable straight to path; returns the frame count."""
+    writer = open_writer(path, frame_duration, loop, palette)
+    count = 0
+    try:
+        for frame, duration in frames:
+            writer.write(frame, duration)
+            count += 1
+    finally:
+        writer.close()
+    return count
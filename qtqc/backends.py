@@ -0,0 +1,100 @@
+# One shared instance of every backend the scripts use.
+#
+# Building a backend is not free: AerSimulator.from_backend and
+# NoiseModel.from_backend read the whole device property set, and the
+# fake devices load their JSON snapshots. The registry builds each named
+# backend, noise model and device simulator on first use and hands the
+# same object to every later caller in the process.
+#
+#   ideal           noiseless AerSimulator
+#   density_matrix  AerSimulator(method="density_matrix")
+#   stabilizer      AerSimulator(method="stabilizer"), Clifford circuits only
+#   thermal_low / thermal_mid / thermal_high
+#                   AerSimulator with the temp-*.py T1/T2 presets
+#   fake_<device>   qiskit_ibm_runtime fake device, e.g. fake_lima, fake_manila
+#
+# simulator(name) is the matching AerSimulator (from_backend for fake
+# devices) and noise_model(name) its NoiseModel.
+import threading
+
+from qtqc.noise_sweep import thermal_noise_model
+
+# (T1, T2) in seconds, as in temp-choice.py / temp-decoherence.py
+THERMAL_PRESETS = {
+    "thermal_low": (100e-6, 80e-6),
+    "thermal_mid": (20e-6, 16e-6),
+    "thermal_high": (5e-6, 4e-6),
+}
+
+_lock = threading.RLock()
+_backends = {}
+_noise_models = {}
+_simulators = {}
+
+
+def fake_device(name):
+    """fake_lima -> FakeLimaV2(), fake_brisbane -> FakeBrisbane() from qiskit_ibm_runtime.fake_provider.
+
+    Class names are matched case-insensitively, preferring the V2 class when both exist.
+    """
+    from qiskit_ibm_runtime import fake_provider
+    device = name[len("fake_"):].replace("_", "").lower()
+    classes = {attr.lower(): attr for attr in dir(fake_provider) if attr.startswith("Fake")}
+    for candidate in (f"fake{device}v2", f"fake{device}"):
+        if candidate in classes:
+            return getattr(fake_provider, classes[candidate])()
+    raise KeyError(f"unknown fake device {name!r}")
+
+
+def _build(name):
+    from qiskit_aer import AerSimulator
+    if name == "ideal":
+        return AerSimulator()
+    if name == "density_matrix":
+        return AerSimulator(method="density_matrix")
+    if name == "stabilizer":
+        return AerSimulator(method="stabilizer")
+    if name in THERMAL_PRESETS:
+        return AerSimulator(noise_model=noise_model(name))
+    if name.startswith("fake_"):
+        return fake_device(name)
+    raise KeyError(f"unknown backend {name!r}")
+
+
+def get_backend(name="ideal"):
+    """The shared backend for name, built on first use."""
+    with _lock:
+        if name not in _backends:
+            _backends[name] = _build(name)
+        return _backends[name]
+
+
+def noise_model(name):
+    """The shared NoiseModel for a thermal preset or fake device."""
+    with _lock:
+        if name not in _noise_models:
+            if name in THERMAL_PRESETS:
+                _noise_models[name] = thermal_noise_model(*THERMAL_PRESETS[name])
+            else:
+                from qiskit_aer.noise import NoiseModel
+                _noise_models[name] = NoiseModel.from_backend(get_backend(name))
+        return _noise_models[name]
+
+
+def simulator(name="ideal"):
+    """An AerSimulator for name: the backend itself, or AerSimulator.from_backend for fake devices."""
+    with _lock:
+        if name not in _simulators:
+            if name.startswith("fake_"):
+                from qiskit_aer import AerSimulator
+                _simulators[name] = AerSimulator.from_backend(get_backend(name))
+            else:
+                _simulators[name] = get_backend(name)
+        return _simulators[name]
+
+
+def clear():
+    with _lock:
+        _backends.clear()
+        _noise_models.clear()
+        _simulators.clear()
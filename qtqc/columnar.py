@@ -0,0 +1,68 @@
+# Columns of NumPy arrays <-> compact columnar files.
+#
+# Parquet and Feather go through pyarrow when it is installed; without it
+# the same columns are written as a compressed .npz. Square-matrix columns
+# (N, d, d) are stored as fixed-size lists of their flattened real and
+# imaginary parts and reshaped on load.
+import os
+
+import numpy as np
+
+
+def save_columns(path, columns):
+    """Write sweep columns to .parquet/.feather (pyarrow) or .npz; returns the path written."""
+    ext = os.path.splitext(path)[1]
+    if ext in (".parquet", ".feather"):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            path = os.path.splitext(path)[0] + ".npz"
+        else:
+            arrays = {}
+            for name, values in columns.items():
+                if values.ndim == 1:
+                    arrays[name] = pa.array(values)
+                    continue
+                # Matrices become fixed-size lists of their flattened real and imaginary parts
+                flat = values.reshape(len(values), -1)
+                for part, data in (("re", flat.real), ("im", flat.imag)):
+                    arrays[f"{name}_{part}"] = pa.FixedSizeListArray.from_arrays(
+                        pa.array(np.ascontiguousarray(data).ravel()), flat.shape[1])
+            table = pa.table(arrays)
+            if ext == ".parquet":
+                import pyarrow.parquet as pq
+                pq.write_table(table, path, compression="zstd")
+            else:
+                import pyarrow.feather as feather
+                feather.write_feather(table, path, compression="zstd")
+            return path
+    np.savez_compressed(path, **columns)
+    return path if path.endswith(".npz") else path + ".npz"
+
+
+def load_columns(path):
+    """Read columns written by save_columns back into NumPy arrays."""
+    ext = os.path.splitext(path)[1]
+    if ext == ".npz":
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path)
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name).combine_chunks()
+        if not name.endswith(("_re", "_im")):
+            columns[name] = column.to_numpy(zero_copy_only=False)
+            continue
+        values = column.flatten().to_numpy().reshape(len(column), -1)
+        base = name[:-3]
+        columns[base] = columns.get(base, 0) + (values if name.endswith("_re") else 1j * values)
+    for name, values in columns.items():
+        if name.startswith("rho_"):
+            d = int(np.sqrt(values.shape[1]))
+            columns[name] = values.reshape(-1, d, d)
+    return columns
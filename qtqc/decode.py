@@ -0,0 +1,108 @@
+# Vectorized decoding of measured shots into named integer fields.
+#
+# The scripts used to take one bitstring at a time, reverse it and call
+# int() per character. Here a whole batch of shots becomes one (shots,
+# width) uint8 array (column i = clbit i) and each field is extracted with
+# one matrix product against its bit weights, so a million shots cost a
+# few array operations. A layout names the fields, least significant bit
+# first:
+#
+#   "zoom = q0..q3, video = q4..q5"
+#
+# qN is bit N of each shot's memory, which is qubit N in every script that
+# measures qubit i into clbit i. Shots can be Aer memory strings, an
+# unpacked bit array, or a packed qiskit BitArray (SamplerV2 results).
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from qtqc.sampling import memory_to_bits
+
+FIELD = re.compile(r"^\s*(\w+)\s*=\s*q(\d+)(?:\s*\.\.\s*q(\d+))?\s*$")
+
+
+def parse_layout(spec):
+    """{name: [bit, ...]} from "name = qA..qB, ..." (or "name = qA" for one bit)."""
+    fields = {}
+    for part in spec.split(","):
+        match = FIELD.match(part)
+        if not match:
+            raise ValueError(f"bad layout field {part.strip()!r}, expected 'name = qA..qB'")
+        name, first, last = match.group(1), int(match.group(2)), match.group(3)
+        last = first if last is None else int(last)
+        step = 1 if last >= first else -1
+        fields[name] = list(range(first, last + step, step))
+    return fields
+
+
+def field_dtype(num_bits):
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if num_bits <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"fields are limited to 64 bits, got {num_bits}")
+
+
+class Layout:
+    """Named bit fields of a shot; decode() turns a batch of shots into a structured array."""
+
+    def __init__(self, fields):
+        if isinstance(fields, str):
+            fields = parse_layout(fields)
+        self.fields = {name: list(bits) for name, bits in fields.items()}
+        self.width = max(max(bits) for bits in self.fields.values()) + 1
+        self.dtype = np.dtype([(name, field_dtype(len(bits))) for name, bits in self.fields.items()])
+        self.weights = {name: np.left_shift(np.uint64(1), np.arange(len(bits), dtype=np.uint64))
+                        for name, bits in self.fields.items()}
+
+    def decode(self, shots):
+        bits = as_bits(shots)
+        if bits.shape[1] < self.width:
+            raise ValueError(f"layout needs {self.width} bits per shot, shots have {bits.shape[1]}")
+        out = np.empty(len(bits), dtype=self.dtype)
+        for name, columns in self.fields.items():
+            out[name] = bits[:, columns].astype(np.uint64) @ self.weights[name]
+        return out
+
+    def stream(self, batches):
+        """Decoded structured array per batch, for batches from run_memory() or any iterable of shots."""
+        for shots in batches:
+            yield self.decode(shots)
+
+    def records(self, batches):
+        """One tuple of field values per shot across all batches."""
+        for decoded in self.stream(batches):
+            yield from decoded.tolist()
+
+
+@lru_cache(maxsize=None)
+def layout(spec):
+    """Cached Layout for a spec string."""
+    return Layout(spec)
+
+
+def decode(shots, spec):
+    return layout(spec).decode(shots)
+
+
+def unpack(packed, num_bits):
+    """Packed shots in qiskit BitArray order (big-endian bytes, clbit 0 last) -> (shots, num_bits) bits."""
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8), axis=-1)
+    return bits.reshape(-1, bits.shape[-1])[:, ::-1][:, :num_bits]
+
+
+def as_bits(shots):
+    """(shots, width) uint8 array with column i = clbit i, from memory strings, bits or a BitArray."""
+    if hasattr(shots, "num_bits") and hasattr(shots, "array"):  # qiskit BitArray
+        return unpack(shots.array, shots.num_bits)
+    if isinstance(shots, np.ndarray):
+        return shots if shots.ndim == 2 else shots.reshape(1, -1)
+    return memory_to_bits(list(shots))
+
+
+def run_memory(tqc, backend, shots, batch_shots=1 << 16):
+    """Per-shot memory for `shots` shots of a transpiled circuit, one list per job of at most batch_shots."""
+    while shots > 0:
+        n = min(shots, batch_shots)
+        yield backend.run(tqc, shots=n, memory=True).result().get_memory()
+        shots -= n
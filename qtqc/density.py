@@ -0,0 +1,74 @@
+# Density-matrix sweeps that keep only the reduced states asked for.
+#
+# The full n-qubit density matrix is 4**n complex numbers, so instead of
+# saving it, every sweep point gets one save_density_matrix(qubits=...)
+# per requested subsystem. Aer traces out the rest inside the simulation
+# and only the small matrices come back. Purity Tr(rho^2) and
+# l1-coherence (sum of |off-diagonal| entries) are computed from those,
+# batched over all points.
+#
+# Product circuits with single-qubit subsystems skip Aer and use the
+# closed-form per-qubit states from qtqc.noise_sweep.
+#
+# Results are a dict of columns; save_columns() writes Parquet or Feather
+# when pyarrow is installed, and a compressed .npz otherwise.
+import numpy as np
+
+from qtqc.columnar import load_columns, save_columns  # noqa: F401 (re-exported)
+from qtqc.noise_sweep import NOISY_GATES, is_product_circuit, product_states, with_thermal_noise
+from qtqc.transpile_cache import cached_transpile
+
+
+def purity(rho):
+    """Tr(rho^2) for a (N, d, d) batch."""
+    return np.einsum("nij,nji->n", rho, rho).real
+
+
+def l1_coherence(rho):
+    """Sum of |off-diagonal| entries for a (N, d, d) batch."""
+    diagonal = np.abs(np.diagonal(rho, axis1=1, axis2=2)).sum(axis=1)
+    return np.abs(rho).sum(axis=(1, 2)) - diagonal
+
+
+def label_for(qubits):
+    return "q" + "_".join(str(q) for q in qubits)
+
+
+def reduced_states(circuit, points, subsystems=None, gates=NOISY_GATES, exact=True):
+    """{label: (N, d, d) reduced density matrices} for each subsystem (default: every qubit)."""
+    from qtqc.backends import get_backend
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    circuit = circuit.remove_final_measurements(inplace=False)
+    if subsystems is None:
+        subsystems = [[q] for q in range(circuit.num_qubits)]
+    backend = get_backend("density_matrix")
+    # optimization_level=0 keeps the id gates that model idle time
+    tqc = cached_transpile(circuit, backend, optimization_level=0)
+
+    if exact and is_product_circuit(tqc) and all(len(qubits) == 1 for qubits in subsystems):
+        states, _ = product_states(tqc, points, gates)
+        return {label_for(qubits): states[qubits[0]] for qubits in subsystems}
+
+    circuits = []
+    for point in points:
+        noisy = with_thermal_noise(tqc, *point, gates)
+        for qubits in subsystems:
+            noisy.save_density_matrix(qubits=qubits, label=label_for(qubits))
+        circuits.append(noisy)
+    result = backend.run(circuits).result()
+    return {
+        label_for(qubits): np.stack([np.asarray(result.data(i)[label_for(qubits)]) for i in range(len(points))])
+        for qubits in subsystems
+    }
+
+
+def density_sweep(circuit, points, subsystems=None, gates=NOISY_GATES, exact=True, keep_states=True):
+    """Columns T1, T2, gate_time and, per subsystem, purity_<label>, l1_<label> and rho_<label>."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    columns = {"T1": points[:, 0], "T2": points[:, 1], "gate_time": points[:, 2]}
+    for label, rho in reduced_states(circuit, points, subsystems, gates, exact).items():
+        columns[f"purity_{label}"] = purity(rho)
+        columns[f"l1_{label}"] = l1_coherence(rho)
+        if keep_states:
+            columns[f"rho_{label}"] = rho
+    return columns
@@ -0,0 +1,46 @@
+# Exact-uniform integers from a stream of measured bits.
+#
+# A fast dice roller (Lumbroso, 2013) that keeps its leftover state between
+# draws: (v, c) means "c is uniform over range(v)". Doubling v and shifting
+# in one measured bit keeps c uniform, and once v >= n we split v into
+# q = v // n full blocks of n plus a remainder. Landing in a full block gives
+# an unbiased c % n *and* a still-uniform c // n over range(q) for the next
+# draw; landing in the remainder keeps c uniform over range(v % n). No
+# measured bit is ever thrown away. Growing v a few bits past n before
+# splitting (``headroom``) makes the remainder rare, so the cost per draw
+# approaches log2(n) bits instead of the ~log2(n) + 1 of a bare roller.
+
+
+class UniformDecoder:
+    """Turn a stream of 0/1 bits into exactly uniform integers over any range."""
+
+    def __init__(self, bits, headroom=16):
+        self.bits = iter(bits)
+        self.headroom = headroom
+        self.v = 1  # c is uniform over range(v)
+        self.c = 0
+        self.bits_used = 0
+        self.draws = 0
+
+    def randrange(self, n):
+        if n < 1:
+            raise ValueError("randrange() needs n >= 1")
+        v, c = self.v, self.c
+        while True:
+            while v < (n << self.headroom):
+                v <<= 1
+                c = (c << 1) | next(self.bits)
+                self.bits_used += 1
+            q, r = divmod(v, n)
+            if c < q * n:
+                self.v, self.c = q, c // n
+                self.draws += 1
+                return c % n
+            # Landed in the remainder: it is still uniform over range(r)
+            v, c = r, c - q * n
+
+    def choice(self, seq):
+        return seq[self.randrange(len(seq))]
+
+    def bits_per_draw(self):
+        return self.bits_used / self.draws if self.draws else 0.0
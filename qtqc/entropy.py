@@ -0,0 +1,276 @@
+# Interchangeable randomness sources for the choice scripts.
+#
+# Every source is a bit_source like qtqc.sampling.sample_bits: called with
+# a bit count, it returns that many bits as a uint8 array. So any of them
+# can feed UniformDecoder, stream_bits, expand_generation or lite.sample.
+#
+#   aer                 uniform qubits on the ideal simulator
+#   fake_<device>       the same circuit on a fake IBM device (readout noise included)
+#   gmc / gmc_fake      radioactive decay from a GMC counter (or FakeGMC)
+#   replay:<path>       bits recorded earlier with record(), for deterministic runs
+#
+# Append "+von_neumann" or "+toeplitz" to debias any of them, e.g.
+# "fake_lima+von_neumann". QTQC_ENTROPY picks the source for scripts that
+# call configured_source().
+#
+# The counter gives one CPS reading a second, and each comparison of two
+# readings is worth at most one raw bit, so GMC bits arrive at well under a
+# bit per second. HarvestedPool runs a source on a background thread and
+# keeps a pool of bits ahead of demand, so draws only block when the pool
+# is empty.
+#
+#   python -m qtqc.entropy   # check every extractor returns bits from a fast FakeGMC
+import os
+import threading
+from collections import deque
+from functools import partial
+
+import numpy as np
+
+from qtqc.sampling import sample_bits
+
+TOEPLITZ_SEED = 0x5EED
+SLOW_SOURCES = {"gmc", "gmc_fake"}  # well under a bit per second
+
+
+def von_neumann(bits):
+    """Pairs 01 -> 0, 10 -> 1; 00 and 11 are dropped. Removes bias from independent bits."""
+    pairs = np.asarray(bits, dtype=np.uint8)[: len(bits) // 2 * 2].reshape(-1, 2)
+    keep = pairs[:, 0] != pairs[:, 1]
+    return pairs[keep, 0]
+
+
+def toeplitz_matrix(n_in, n_out, seed=TOEPLITZ_SEED):
+    """n_out x n_in binary Toeplitz matrix from a fixed public seed."""
+    diagonals = np.random.default_rng(seed).integers(0, 2, n_in + n_out - 1, dtype=np.uint8)
+    rows = np.arange(n_out)[:, None]
+    cols = np.arange(n_in)[None, :]
+    return diagonals[rows - cols + n_in - 1]
+
+
+def toeplitz(bits, n_in=256, n_out=128, seed=TOEPLITZ_SEED):
+    """Toeplitz-hash each whole n_in-bit block down to n_out bits (a two-universal extractor)."""
+    blocks = np.asarray(bits, dtype=np.uint8)[: len(bits) // n_in * n_in].reshape(-1, n_in)
+    matrix = toeplitz_matrix(n_in, n_out, seed).astype(np.int32)
+    return ((blocks.astype(np.int32) @ matrix.T) & 1).astype(np.uint8).ravel()
+
+
+EXTRACTORS = {"von_neumann": von_neumann, "toeplitz": toeplitz}
+BLOCK_BITS = {von_neumann: 2, toeplitz: 256}  # raw bits each extractor consumes as a unit
+
+
+class Extracted:
+    """bit_source that pulls raw bits from `source` and returns only extracted output.
+
+    Raw bits are buffered until they fill whole extractor blocks, so a source
+    drawn in chunks smaller than a block (GMC) never loses bits to a partial block.
+    """
+
+    def __init__(self, source, extractor=von_neumann, raw_chunk=256):
+        self.source = source
+        self.extractor = extractor
+        self.raw_chunk = raw_chunk
+        self.block = BLOCK_BITS.get(extractor, 1)
+        self.raw = np.zeros(0, dtype=np.uint8)
+        self.out = np.zeros(0, dtype=np.uint8)
+
+    def __call__(self, num_bits):
+        while len(self.out) < num_bits:
+            self.raw = np.concatenate([self.raw, np.asarray(self.source(self.raw_chunk), dtype=np.uint8)])
+            whole = len(self.raw) // self.block * self.block
+            if whole:
+                self.out = np.concatenate([self.out, self.extractor(self.raw[:whole])])
+                self.raw = self.raw[whole:]
+        bits, self.out = self.out[:num_bits], self.out[num_bits:]
+        return bits
+
+    def stop(self):
+        if hasattr(self.source, "stop"):
+            self.source.stop()
+
+
+class GMCSource:
+    """Raw bits from decay counts: 1 if a one-second count beats the next, 0 if lower, ties dropped.
+
+    Consecutive non-overlapping counts are independent and identically
+    distributed, so either order is equally likely whatever the source rate.
+    """
+
+    def __init__(self, device, interval=None):
+        self.device = device
+        self.interval = getattr(device, "window", 1.0) if interval is None else interval
+        self.stopping = threading.Event()
+
+    def count(self):
+        if self.stopping.wait(self.interval):  # next non-overlapping window
+            raise EOFError("GMC source stopped")
+        return int(self.device.get_cps())
+
+    def stop(self):
+        self.stopping.set()
+
+    def __call__(self, num_bits):
+        bits = np.zeros(num_bits, dtype=np.uint8)
+        filled = 0
+        while filled < num_bits:
+            a, b = self.count(), self.count()
+            if a != b:
+                bits[filled] = a > b
+                filled += 1
+        return bits
+
+
+class ReplaySource:
+    """Bits recorded by record(), handed out in order; EOFError when used up unless loop=True."""
+
+    def __init__(self, path, loop=False):
+        self.bits = np.unpackbits(np.fromfile(path, dtype=np.uint8))
+        self.loop = loop
+        self.pos = 0
+
+    def __call__(self, num_bits):
+        if self.pos + num_bits > len(self.bits):
+            if not self.loop:
+                raise EOFError(f"replay exhausted after {self.pos} bits")
+            self.pos = 0
+        bits = self.bits[self.pos:self.pos + num_bits]
+        self.pos += num_bits
+        return bits
+
+
+def record(source, path, num_bits):
+    """Draw num_bits from source and save them packed for ReplaySource."""
+    np.packbits(source(num_bits)).tofile(path)
+    return path
+
+
+def fake_hardware_bits(num_bits, device="fake_lima"):
+    from qtqc.backends import get_backend
+    backend = get_backend(device)
+    return sample_bits(num_bits, backend=backend, num_qubits=min(5, backend.num_qubits))
+
+
+def entropy_source(spec="aer", device=None):
+    """bit_source for a name such as 'aer', 'fake_lima', 'gmc', 'replay:bits.bin' or 'gmc_fake+toeplitz'.
+
+    device replaces the counter pygmc connects to (gmc) or the default FakeGMC (gmc_fake).
+    """
+    if spec.startswith("replay:"):
+        return ReplaySource(spec[len("replay:"):])
+    name, _, extractor = spec.partition("+")
+    if name == "aer":
+        source = sample_bits
+    elif name.startswith("fake_"):
+        source = partial(fake_hardware_bits, device=name)
+    elif name == "gmc":
+        import pygmc
+        source = GMCSource(device or pygmc.connect())
+    elif name == "gmc_fake":
+        from qtqc.geiger import FakeGMC
+        source = GMCSource(device or FakeGMC())
+    else:
+        raise KeyError(f"unknown entropy source {spec!r}")
+    if extractor:
+        raw_chunk = 16 if name in SLOW_SOURCES else 1 << 16
+        source = Extracted(source, EXTRACTORS[extractor], raw_chunk=raw_chunk)
+    return source
+
+
+def chunk_bits(spec, fast=1 << 16):
+    """Bits to ask a source for per call: a few for slow sources so each call returns
+    promptly, otherwise `fast` so a simulator fills a pool in one backend run."""
+    return 64 if spec.partition("+")[0] in SLOW_SOURCES else fast
+
+
+def configured_source(default=None):
+    """The source named by QTQC_ENTROPY, or default when it is unset."""
+    spec = os.environ.get("QTQC_ENTROPY")
+    return entropy_source(spec) if spec else default
+
+
+class HarvestedPool:
+    """Keeps up to `capacity` bits from `source` ready, refilled by a background thread.
+
+    Callable like any bit_source; a draw blocks only while the pool holds
+    fewer bits than asked for, and raises TimeoutError after `timeout`.
+    """
+
+    def __init__(self, source, capacity=1 << 16, chunk=1024, timeout=None):
+        self.source = source
+        self.capacity = capacity
+        self.chunk = chunk
+        self.timeout = timeout
+        self.chunks = deque()
+        self.level = 0
+        self.error = None
+        self.cond = threading.Condition()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.harvest, daemon=True, name="entropy-harvester")
+        self.thread.start()
+
+    def harvest(self):
+        while not self.stopping.is_set():
+            with self.cond:
+                self.cond.wait_for(lambda: self.level < self.capacity or self.stopping.is_set())
+            if self.stopping.is_set():
+                return
+            try:
+                bits = self.source(self.chunk)  # slow part, outside the lock
+            except Exception as e:
+                with self.cond:
+                    self.error = e
+                    self.cond.notify_all()
+                return
+            with self.cond:
+                self.chunks.append(bits)
+                self.level += len(bits)
+                self.cond.notify_all()
+
+    def __call__(self, num_bits):
+        with self.cond:
+            ready = self.cond.wait_for(lambda: self.level >= num_bits or self.error, self.timeout)
+            if self.level < num_bits:
+                if self.error:
+                    raise self.error
+                if not ready:
+                    raise TimeoutError(f"{num_bits} bits requested, {self.level} harvested")
+            out = np.empty(num_bits, dtype=np.uint8)
+            filled = 0
+            while filled < num_bits:
+                head = self.chunks[0]
+                take = min(len(head), num_bits - filled)
+                out[filled:filled + take] = head[:take]
+                filled += take
+                if take == len(head):
+                    self.chunks.popleft()
+                else:
+                    self.chunks[0] = head[take:]
+            self.level -= num_bits
+            self.cond.notify_all()
+        return out
+
+    def close(self):
+        self.stopping.set()
+        if hasattr(self.source, "stop"):
+            self.source.stop()  # wake a source waiting on its device
+        with self.cond:
+            self.cond.notify_all()
+        self.thread.join()
+
+
+def check_extractors(num_bits=128):
+    """Draw num_bits through every extractor from a fast FakeGMC; returns {spec: bits}."""
+    from qtqc.geiger import FakeGMC
+    drawn = {}
+    for extractor in EXTRACTORS:
+        spec = f"gmc_fake+{extractor}"
+        # ~200 clicks per 5 ms window: ties are rare and a raw bit costs two windows
+        source = entropy_source(spec, device=FakeGMC(rate=40000.0, window=0.005, seed=0))
+        drawn[spec] = source(num_bits)
+        assert len(drawn[spec]) == num_bits, spec
+    return drawn
+
+
+if __name__ == "__main__":
+    for spec, bits in check_extractors().items():
+        print(f"{spec:24s} {len(bits)} bits, mean {bits.mean():.3f}")
@@ -0,0 +1,154 @@
+# Decode-once frame cache for the video player.
+#
+# Each source is decoded a single time (optionally resized) into a raw
+# uint8 file of shape (frames, height, width, 3) with a small JSON sidecar,
+# named after the source's absolute path and the target size.
+# Playback then maps that file and hands out frames as zero-copy views, so
+# decoding leaves the playback path entirely and seeking or looping is just
+# an index.
+#
+#   python -m qtqc.framecache video-00.mov video-01.mov --out .frame-cache --size 1920x1080
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+import cv2
+import numpy as np
+
+
+def cache_paths(path, cache_dir, size=None):
+    """Frame and sidecar paths, unique per absolute source path and target size."""
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:12]
+    suffix = f"-{size[0]}x{size[1]}" if size else ""
+    stem = os.path.join(cache_dir, f"{os.path.basename(path)}-{digest}{suffix}")
+    return stem + ".frames", stem + ".json"
+
+
+def source_info(path, size):
+    stat = os.stat(path)
+    return {"source": os.path.abspath(path), "mtime": stat.st_mtime, "bytes": stat.st_size, "size": size}
+
+
+def is_fresh(path, cache_dir, size=None):
+    raw, meta = cache_paths(path, cache_dir, size)
+    if not (os.path.exists(raw) and os.path.exists(meta)):
+        return False
+    with open(meta) as f:
+        info = json.load(f)
+    expected = source_info(path, list(size) if size else None)
+    return all(info.get(k) == v for k, v in expected.items())
+
+
+def transcode(path, cache_dir, size=None):
+    """Decode path once into cache_dir, resized to size=(width, height) if given."""
+    os.makedirs(cache_dir, exist_ok=True)
+    raw, meta = cache_paths(path, cache_dir, size)
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    count = 0
+    width = height = None
+    with open(raw + ".tmp", "wb") as f:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if size:
+                frame = cv2.resize(frame, tuple(size), interpolation=cv2.INTER_AREA)
+            height, width = frame.shape[:2]
+            f.write(np.ascontiguousarray(frame).data)
+            count += 1
+    cap.release()
+    if count == 0:
+        os.remove(raw + ".tmp")
+        raise ValueError(f"could not decode any frames from {path}")
+    os.replace(raw + ".tmp", raw)
+    info = source_info(path, list(size) if size else None)
+    info.update(frames=count, width=width, height=height, fps=fps)
+    with open(meta, "w") as f:
+        json.dump(info, f, indent=2)
+    return raw
+
+
+class MappedSource:
+    """A transcoded video mapped read-only; drop-in for CaptureSource in CapturePool."""
+
+    def __init__(self, path, cache_dir, size=None):
+        if not is_fresh(path, cache_dir, size):
+            transcode(path, cache_dir, size)
+        raw, meta = cache_paths(path, cache_dir, size)
+        with open(meta) as f:
+            info = json.load(f)
+        self.path = path
+        self.fps = info["fps"]
+        self.width = info["width"]
+        self.height = info["height"]
+        self.frames = np.memmap(raw, dtype=np.uint8, mode="r", shape=(info["frames"], self.height, self.width, 3))
+        self.views = []
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.frames)
+
+    def start(self):
+        pass  # nothing to decode ahead
+
+    def view(self):
+        view = MappedView(self)
+        with self.lock:
+            self.views.append(view)
+        return view
+
+    def seek(self, frame_no):
+        with self.lock:
+            for view in self.views:
+                view.cursor = frame_no
+
+    def stop(self):
+        pass
+
+    def join(self):
+        pass  # the map is released with the last array that views it
+
+
+class MappedView:
+    """Read cursor over a MappedSource; frames are read-only views into the map."""
+
+    def __init__(self, source):
+        self.source = source
+        self.cursor = 0
+
+    def read(self, timeout=None):
+        frames = self.source.frames
+        frame = frames[self.cursor % len(frames)]  # looping is just the modulo
+        self.cursor += 1
+        return frame
+
+    def seek(self, frame_no):
+        self.source.seek(frame_no)
+
+    def close(self):
+        with self.source.lock:
+            self.source.views.remove(self)
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-decode videos into memory-mappable frame files")
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--out", default=".frame-cache", help="cache directory")
+    parser.add_argument("--size", type=parse_size, help="target resolution, e.g. 1920x1080")
+    parser.add_argument("--force", action="store_true", help="transcode even if the cache is fresh")
+    args = parser.parse_args()
+
+    for video in args.videos:
+        if not args.force and is_fresh(video, args.out, args.size):
+            print(f"{video}: cached")
+            continue
+        raw = transcode(video, args.out, args.size)
+        print(f"{video}: {os.path.getsize(raw) / 1e6:.1f} MB -> {raw}")
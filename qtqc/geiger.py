@@ -0,0 +1,272 @@
+# Timestamped Geiger counter readings as an asyncio stream.
+#
+# The device is polled on its own thread, so a blocking serial read never
+# stalls the event loop and a blocked stdout never delays a poll. Polls run
+# on a fixed monotonic schedule (next_due += interval) instead of sleeping
+# a fixed time after each read, so jitter does not accumulate into the
+# rate. Each reading is stamped with the midpoint of the request on the
+# monotonic clock, anchored once to wall time.
+#
+# Every reading is appended to the binary log from the reader thread
+# before it is published, so nothing is lost if consumers fall behind.
+# Subscribers get bounded asyncio queues; a full queue drops its oldest
+# reading (counted in `dropped`) rather than blocking acquisition. The
+# same stream is served to other processes over a Unix socket, one
+# "t_ns cps" line per reading.
+#
+# A failed poll (serial timeout, unplugged USB) is counted, logged and
+# retried with exponential backoff. After max_failures in a row the reader
+# gives up and every subscriber and socket client gets a terminal
+# AcquisitionError instead of waiting forever.
+#
+# Note the GMC CPS command reports counts in the last second, so polling
+# faster than interval=1.0 counts the same events more than once.
+import asyncio
+import logging
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from qtqc.sockets import remove_stale_socket
+
+log = logging.getLogger(__name__)
+
+Reading = namedtuple("Reading", "t_ns cps")
+
+
+class AcquisitionError(RuntimeError):
+    """The service stopped polling because the device kept failing."""
+
+LOG_MAGIC = b"QTGC\x01\x00\x00\x00"
+RECORD = struct.Struct("<qI")  # wall-anchored monotonic ns, counts per second
+LOG_DTYPE = np.dtype([("t_ns", "<i8"), ("cps", "<u4")])
+
+
+class EventLog:
+    """Append-only binary log of readings: an 8-byte header, then fixed 12-byte records."""
+
+    def __init__(self, path):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "ab")
+        if new:
+            self.file.write(LOG_MAGIC)
+            self.file.flush()
+
+    def write(self, reading):
+        self.file.write(RECORD.pack(*reading))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_log(path):
+    """All readings in a log as a structured array with t_ns and cps columns."""
+    with open(path, "rb") as f:
+        if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} is not a Geiger event log")
+    return np.fromfile(path, dtype=LOG_DTYPE, offset=len(LOG_MAGIC))
+
+
+class FakeGMC:
+    """Stands in for a pygmc device: Poisson clicks at `rate`, get_cps() counts the last `window` seconds."""
+
+    def __init__(self, rate=5.0, latency=0.0, seed=None, window=1.0):
+        self.rate = rate
+        self.latency = latency
+        self.window = window
+        self.rng = np.random.default_rng(seed)
+        self.clicks = []
+        self.generated_until = time.monotonic()
+        self.lock = threading.Lock()
+        self.flash = b""
+
+    def get_cps(self):
+        if self.latency:
+            time.sleep(self.latency)  # serial round trip
+        now = time.monotonic()
+        with self.lock:
+            t = self.generated_until
+            while True:
+                t += self.rng.exponential(1 / self.rate)
+                if t > now:
+                    break
+                self.clicks.append(t)
+            self.generated_until = now
+            self.clicks = [c for c in self.clicks if c > now - self.window]
+            return len(self.clicks)
+
+    # Flash history, laid out as on the device so pygmc's HistoryParser reads it
+    _flash_memory_size_bytes = 2**20
+    _flash_memory_page_size_bytes = 2**11
+    SAVE_MODES = {"every second": 1, "every minute": 2, "every hour": 3}
+
+    def log_history(self, start, counts, mode="every minute"):
+        """Append a context record at datetime start followed by one count per period."""
+        context = bytes([start.year % 100, start.month, start.day, start.hour, start.minute, start.second])
+        data = b"\x55\xaa\x00" + context + b"\x55\xaa" + bytes([self.SAVE_MODES[mode]])
+        for count in counts:
+            # Single bytes, except values that would read as a command or end of data
+            data += bytes([count]) if count < 85 else b"\x55\xaa\x01" + int(count).to_bytes(2, "big")
+        self.flash += data
+
+    def _read_history_position(self, start_position, chunk_size):
+        chunk = self.flash[start_position:start_position + chunk_size]
+        return chunk + b"\xff" * (chunk_size - len(chunk))
+
+
+class GeigerService:
+    """Polls a device on a reader thread and publishes Readings to asyncio subscribers."""
+
+    def __init__(self, device, interval=1.0, log_path=None, queue_size=256, max_failures=10, max_backoff=30.0):
+        self.device = device
+        self.interval = interval
+        self.log = EventLog(log_path) if log_path else None
+        self.queue_size = queue_size
+        self.max_failures = max_failures  # None retries forever
+        self.max_backoff = max_backoff
+        self.subscribers = []
+        self.dropped = 0
+        self.readings = 0
+        self.errors = 0
+        self.error = None  # terminal AcquisitionError once the reader gives up
+        self.stopping = threading.Event()
+        self.thread = None
+        self.loop = None
+        self.wall_anchor = time.time_ns()
+        self.mono_anchor = time.monotonic_ns()
+
+    def subscribe(self, maxsize=None):
+        queue = asyncio.Queue(maxsize or self.queue_size)
+        if self.error:
+            queue.put_nowait(self.error)
+        self.subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.remove(queue)
+
+    def publish(self, reading):
+        """Queue a Reading, or the terminal AcquisitionError, for every subscriber."""
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(reading)
+
+    def poll(self):
+        before = time.monotonic_ns()
+        cps = int(self.device.get_cps())
+        after = time.monotonic_ns()
+        return Reading(self.wall_anchor + (before + after) // 2 - self.mono_anchor, cps)
+
+    def reader(self):
+        next_due = time.monotonic()
+        failures = 0
+        while not self.stopping.is_set():
+            try:
+                reading = self.poll()
+            except Exception as e:
+                self.errors += 1
+                failures += 1
+                log.warning("GMC poll failed (%d in a row): %r", failures, e)
+                if self.max_failures is not None and failures >= self.max_failures:
+                    self.fail(AcquisitionError(f"gave up after {failures} failed polls: {e!r}"), e)
+                    break
+                self.stopping.wait(min(self.interval * 2 ** failures, self.max_backoff))
+                next_due = time.monotonic()
+                continue
+            failures = 0
+            self.readings += 1
+            if self.log:
+                self.log.write(reading)
+            try:
+                self.loop.call_soon_threadsafe(self.publish, reading)
+            except RuntimeError:  # event loop already closed
+                break
+            next_due += self.interval
+            if next_due < time.monotonic():
+                next_due = time.monotonic()  # fell behind: resync instead of bursting
+            self.stopping.wait(next_due - time.monotonic())
+
+    def fail(self, error, cause):
+        error.__cause__ = cause
+        self.error = error
+        try:
+            self.loop.call_soon_threadsafe(self.publish, error)
+        except RuntimeError:  # event loop already closed
+            pass
+
+    async def stream(self):
+        """Async iterator of Readings; raises AcquisitionError if the reader gives up."""
+        queue = self.subscribe()
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, AcquisitionError):
+                    raise item
+                yield item
+        finally:
+            self.unsubscribe(queue)
+
+    def start(self):
+        """Start polling; call from inside the running event loop."""
+        self.loop = asyncio.get_running_loop()
+        self.thread = threading.Thread(target=self.reader, daemon=True, name="geiger-reader")
+        self.thread.start()
+
+    async def stop(self):
+        self.stopping.set()
+        if self.thread:
+            await asyncio.to_thread(self.thread.join)
+        if self.log:
+            self.log.close()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def handle_client(self, reader, writer):
+        queue = self.subscribe()
+        try:
+            while True:
+                reading = await queue.get()
+                if isinstance(reading, AcquisitionError):
+                    writer.write(f"error {reading}\n".encode())
+                    await writer.drain()
+                    break
+                writer.write(f"{reading.t_ns} {reading.cps}\n".encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.unsubscribe(queue)
+            writer.close()
+
+    async def serve(self, path):
+        """Stream readings to every client of a Unix socket at path (EADDRINUSE if another service owns it)."""
+        remove_stale_socket(path)
+        return await asyncio.start_unix_server(self.handle_client, path)
+
+
+async def subscribe_socket(path):
+    """Async iterator of Readings from a GeigerService socket in another process.
+
+    Raises AcquisitionError when the service reports that polling stopped.
+    """
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        while line := await reader.readline():
+            if line.startswith(b"error "):
+                raise AcquisitionError(line[len(b"error "):].decode().strip())
+            t_ns, cps = line.split()
+            yield Reading(int(t_ns), int(cps))
+    finally:
+        writer.close()
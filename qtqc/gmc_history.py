@@ -0,0 +1,168 @@
+# Incremental GMC flash-history ingestion into a day-partitioned store.
+#
+# get_history_data() re-reads the whole flash (up to ~5 minutes for 1 MiB
+# over serial) and re-parses it on every call. The store keeps a raw
+# mirror of the flash pages already read, so an ingest re-reads only the
+# last partially filled page and whatever was written after it, and
+# parses only from the last context record before the new bytes.
+# Rows newer than the last ingested timestamp are appended as one file per
+# day and run:
+#
+#   <root>/day=2025-01-31/part-20250131T120000.parquet
+#
+# Windowed queries open only the day partitions that overlap the window
+# and aggregate with NumPy. Files are Parquet by default (Feather or .npz
+# via `ext`; .npz without pyarrow), see qtqc.columnar.
+import glob
+import json
+import os
+
+import numpy as np
+
+from qtqc.columnar import load_columns, save_columns
+
+CONTEXT_MARKER = b"\x55\xaa\x00"  # context record: save mode and reference datetime
+PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def period_seconds(mode):
+    for word, seconds in PERIOD_SECONDS.items():
+        if word in mode:
+            return seconds
+    return 0
+
+
+def read_flash(device, start_page):
+    """Flash pages from start_page up to the first blank page, as one bytes object."""
+    page_size = device._flash_memory_page_size_bytes
+    data = b""
+    for position in range(start_page * page_size, device._flash_memory_size_bytes, page_size):
+        page = device._read_history_position(position, page_size)
+        if page.count(b"\xff") == page_size:
+            break
+        data += page
+    return data
+
+
+def parse_rows(raw):
+    """Rows (datetime, count, unit, mode) parsed by pygmc from raw flash bytes starting at a context record."""
+    from pygmc.history import HistoryParser
+    return [row[:4] for row in HistoryParser(data=raw).get_data()]
+
+
+def rows_to_columns(rows):
+    datetimes, counts, units, modes = zip(*rows) if rows else ((), (), (), ())
+    return {
+        "datetime": np.array(datetimes, dtype="datetime64[s]"),
+        "count": np.array(counts, dtype=np.int64),
+        "unit": np.array(units, dtype=str),
+        "mode": np.array(modes, dtype=str),
+        "seconds": np.array([period_seconds(m) for m in modes], dtype=np.int32),
+    }
+
+
+class HistoryStore:
+    """Day-partitioned GMC history under root, with a raw flash mirror and ingest state."""
+
+    def __init__(self, root, ext=".parquet"):
+        self.root = root
+        self.ext = ext
+        os.makedirs(root, exist_ok=True)
+        self.mirror_path = os.path.join(root, "flash.raw")
+        self.state_path = os.path.join(root, "state.json")
+        self.state = {"flash_bytes": 0, "last_datetime": None}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+
+    def mirror(self):
+        if not os.path.exists(self.mirror_path):
+            return b""
+        with open(self.mirror_path, "rb") as f:
+            return f.read()
+
+    def ingest(self, device):
+        """Pull flash written since the last ingest and append its new rows; returns the row count."""
+        page_size = device._flash_memory_page_size_bytes
+        known = self.state["flash_bytes"]
+        start_page = known // page_size
+        mirror = self.mirror()
+        fresh = read_flash(device, start_page)
+
+        # A rewritten partial page means the flash was erased: start over
+        if mirror[start_page * page_size:known] != fresh[:known - start_page * page_size]:
+            mirror, known, start_page = b"", 0, 0
+            fresh = read_flash(device, 0)
+
+        flash = (mirror[:start_page * page_size] + fresh).rstrip(b"\xff")
+        with open(self.mirror_path, "wb") as f:
+            f.write(flash)
+        if len(flash) <= known:
+            return 0
+
+        # Parse from the last context record before the new bytes, then keep only new rows
+        start = max(flash.rfind(CONTEXT_MARKER, 0, known + len(CONTEXT_MARKER)), 0)
+        rows = parse_rows(flash[start:])
+        if self.state["last_datetime"]:
+            last = np.datetime64(self.state["last_datetime"], "s")
+            rows = [row for row in rows if np.datetime64(row[0], "s") > last]
+
+        if rows:
+            self.append(rows_to_columns(rows))
+            self.state["last_datetime"] = str(np.datetime64(rows[-1][0], "s"))
+        self.state["flash_bytes"] = len(flash)
+        with open(self.state_path, "w") as f:
+            json.dump(self.state, f)
+        return len(rows)
+
+    def append(self, columns):
+        days = columns["datetime"].astype("datetime64[D]")
+        run = str(columns["datetime"][0]).replace("-", "").replace(":", "")
+        for day in np.unique(days):
+            directory = os.path.join(self.root, f"day={day}")
+            os.makedirs(directory, exist_ok=True)
+            keep = days == day
+            save_columns(os.path.join(directory, f"part-{run}{self.ext}"), {k: v[keep] for k, v in columns.items()})
+
+    def partitions(self, start=None, end=None):
+        """Partition files whose day overlaps [start, end)."""
+        paths = []
+        for directory in sorted(glob.glob(os.path.join(self.root, "day=*"))):
+            day = np.datetime64(os.path.basename(directory)[len("day="):], "D")
+            if start is not None and day < np.datetime64(start, "D"):
+                continue
+            if end is not None and day > np.datetime64(end, "D"):
+                continue
+            paths.extend(sorted(glob.glob(os.path.join(directory, "part-*"))))
+        return paths
+
+    def read(self, start=None, end=None):
+        """Columns for rows with start <= datetime < end, read only from overlapping partitions."""
+        parts = [load_columns(path) for path in self.partitions(start, end)]
+        if not parts:
+            return rows_to_columns([])
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        columns["datetime"] = columns["datetime"].astype("datetime64[s]")
+        keep = np.ones(len(columns["datetime"]), dtype=bool)
+        if start is not None:
+            keep &= columns["datetime"] >= np.datetime64(start, "s")
+        if end is not None:
+            keep &= columns["datetime"] < np.datetime64(end, "s")
+        return {name: values[keep] for name, values in columns.items()}
+
+    def rates(self, start, end, bin_seconds=60):
+        """(bin starts, CPM, CPS) over [start, end) in bins of bin_seconds; NaN where nothing was logged."""
+        start = np.datetime64(start, "s")
+        end = np.datetime64(end, "s")
+        columns = self.read(start, end)
+        # A row's value covers the period before its timestamp; turn it into a click count
+        per_second = np.where(columns["unit"] == "CPM", 1 / 60, 1.0)
+        clicks = columns["count"] * per_second * columns["seconds"]
+        bins = ((columns["datetime"] - start).astype(np.int64) // bin_seconds)
+        num_bins = int(-(-(end - start).astype(np.int64) // bin_seconds))
+        events = np.bincount(bins, clicks, minlength=num_bins)
+        covered = np.bincount(bins, columns["seconds"], minlength=num_bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cps = np.where(covered > 0, events / covered, np.nan)
+        starts = start + np.arange(num_bins) * np.timedelta64(bin_seconds, "s")
+        return starts, cps * 60, cps
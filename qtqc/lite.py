@@ -0,0 +1,142 @@
+# Qiskit-free circuits for the prompt and choice scripts.
+#
+# `import qiskit` takes seconds, and the prompt engines only ever measure
+# circuits whose outcome distribution is known without simulating: every
+# measured qubit gets one H and then only diagonal gates (CZ, Z, S, T,
+# phases), which change phases but never Z-basis probabilities. Those
+# circuits are sampled with NumPy directly. Other Clifford circuits (CX, S,
+# X, a GHZ variant) go through the stabilizer tableau in qtqc.stabilizer,
+# which scales to hundreds of qubits. Anything else is converted to a
+# QuantumCircuit and run on the shared simulator, importing qiskit only then.
+import numpy as np
+
+# Gates that are diagonal in the computational basis
+DIAGONAL_GATES = {"id", "z", "s", "sdg", "t", "tdg", "p", "rz", "cz", "cp", "crz", "rzz", "barrier"}
+
+
+def as_qubits(qubits):
+    return [qubits] if isinstance(qubits, int) else list(qubits)
+
+
+class Circuit:
+    """Records QuantumCircuit-style calls; to_qiskit() replays them."""
+
+    def __init__(self, num_qubits, num_clbits=None):
+        self.num_qubits = num_qubits
+        self.num_clbits = num_qubits if num_clbits is None else num_clbits
+        self.ops = []  # (name, qubits, params)
+        self.measured = {}  # clbit -> qubit
+
+    def append(self, name, qubits, *params):
+        self.ops.append((name, tuple(qubits), params))
+        return self
+
+    def h(self, qubits):
+        for q in as_qubits(qubits):
+            self.append("h", [q])
+        return self
+
+    def id(self, qubits):
+        for q in as_qubits(qubits):
+            self.append("id", [q])
+        return self
+
+    def x(self, qubits):
+        for q in as_qubits(qubits):
+            self.append("x", [q])
+        return self
+
+    def z(self, qubits):
+        for q in as_qubits(qubits):
+            self.append("z", [q])
+        return self
+
+    def s(self, qubits):
+        for q in as_qubits(qubits):
+            self.append("s", [q])
+        return self
+
+    def sdg(self, qubits):
+        for q in as_qubits(qubits):
+            self.append("sdg", [q])
+        return self
+
+    def cz(self, control, target):
+        return self.append("cz", [control, target])
+
+    def cx(self, control, target):
+        return self.append("cx", [control, target])
+
+    def barrier(self):
+        return self.append("barrier", range(self.num_qubits))
+
+    def measure(self, qubits, clbits):
+        for q, c in zip(as_qubits(qubits), as_qubits(clbits)):
+            self.append("measure", [q], c)
+            self.measured[c] = q
+        return self
+
+    def to_qiskit(self):
+        from qiskit import QuantumCircuit
+        qc = QuantumCircuit(self.num_qubits, self.num_clbits)
+        for name, qubits, params in self.ops:
+            if name == "measure":
+                qc.measure(qubits[0], params[0])
+            else:
+                getattr(qc, name)(*params, *qubits)
+        return qc
+
+
+def superposed_qubits(circuit):
+    """Qubits measured uniformly at random, or None if the circuit is not H-then-diagonal."""
+    superposed = set()
+    touched = set()
+    measured = set()
+    for name, qubits, _ in circuit.ops:
+        if name == "barrier":
+            continue
+        if any(q in measured for q in qubits):
+            return None
+        if name == "measure":
+            measured.add(qubits[0])
+        elif name == "h" and qubits[0] not in touched:
+            superposed.add(qubits[0])
+        elif name not in DIAGONAL_GATES:
+            return None
+        touched.update(qubits)
+    return superposed
+
+
+def sample_array(circuit, shots=1, rng=None, fast=True, bit_source=None):
+    """(shots, num_clbits) uint8 array of measured bits, column i = clbit i (see qtqc.decode).
+
+    Uniform bits come from bit_source (see qtqc.entropy) when given, else from rng.
+    """
+    superposed = superposed_qubits(circuit) if fast else None
+    if superposed is None and fast:
+        from qtqc.stabilizer import outcome_map, sample_clifford
+        outcomes = outcome_map(circuit)
+        if outcomes is not None:
+            return sample_clifford(circuit, shots, rng, bit_source, outcomes)
+    if superposed is None:
+        from qtqc.backends import get_backend
+        from qtqc.sampling import memory_to_bits
+        from qtqc.transpile_cache import cached_transpile
+        backend = get_backend("ideal")
+        tqc = cached_transpile(circuit.to_qiskit(), backend)
+        return memory_to_bits(backend.run(tqc, shots=shots, memory=True).result().get_memory())
+
+    rng = rng or np.random.default_rng()
+    bits = np.zeros((shots, circuit.num_clbits), dtype=np.uint8)
+    random = sorted(c for c, q in circuit.measured.items() if q in superposed)
+    if bit_source is not None:
+        bits[:, random] = np.asarray(bit_source(shots * len(random))).reshape(shots, len(random))
+    else:
+        bits[:, random] = rng.integers(0, 2, (shots, len(random)), dtype=np.uint8)
+    return bits
+
+
+def sample(circuit, shots=1, rng=None, fast=True, bit_source=None):
+    """Per-shot measured bitstrings (clbit 0 rightmost, as in qiskit counts)."""
+    bits = sample_array(circuit, shots, rng, fast, bit_source)
+    return ["".join(map(str, row[::-1])) for row in bits]
@@ -0,0 +1,154 @@
+# Whole-generation L-system expansion.
+#
+# Each generation counts its rewritable symbols, draws every rule choice
+# from one block of quantum bits, and builds the next string with a NumPy
+# gather plus a single join, instead of one circuit and one string
+# concatenation per symbol.
+import numpy as np
+
+from qtqc.dice import UniformDecoder
+from qtqc.sampling import sample_bits, stream_bits
+
+
+def uniform_choices(count, n, bit_source=sample_bits):
+    """count exact-uniform integers in range(n) from as few bits as possible."""
+    width = (n - 1).bit_length()
+    if count == 0 or width == 0:
+        return np.zeros(count, dtype=np.intp)
+    if n == 1 << width:
+        # Power of two: every width-bit field is already a uniform choice
+        bits = bit_source(count * width).reshape(count, width).astype(np.intp)
+        return bits @ (1 << np.arange(width))
+    decoder = UniformDecoder(stream_bits(bit_source, chunk=count * width))
+    return np.fromiter((decoder.randrange(n) for _ in range(count)), dtype=np.intp, count=count)
+
+
+def expand_generation(current, rules, bit_source=sample_bits):
+    """Rewrite every symbol of current once, choosing among rules[ch] uniformly."""
+    symbols = np.frombuffer(current.encode("ascii"), dtype=np.uint8)
+    # Identity table: non-rule symbols map to themselves
+    pieces = np.array([chr(i) for i in range(128)], dtype=object)[symbols]
+    for ch, options in rules.items():
+        positions = np.flatnonzero(symbols == ord(ch))
+        if len(positions) == 0:
+            continue
+        choices = uniform_choices(len(positions), len(options), bit_source)
+        pieces[positions] = np.array(options, dtype=object)[choices]
+    return "".join(pieces.tolist())
+
+
+def encode(symbols):
+    return np.frombuffer(symbols.encode("ascii"), dtype=np.uint8)
+
+
+class CompactLSystem:
+    """L-system stored as uint8 symbols plus a derivation tree of rule-choice indices.
+
+    ``choices[g][b][k]`` is the rule index picked for the k-th occurrence of
+    symbol ``b`` in generation ``g``. Generating only needs symbol counts, so
+    the expanded string is never built; ``walk`` replays the tree depth-first
+    with one stack frame per generation.
+    """
+
+    def __init__(self, axiom, rules):
+        self.axiom = encode(axiom)
+        self.rules = {ord(ch): [encode(option) for option in options] for ch, options in rules.items()}
+        # Where the rewritable symbols sit inside each option, for the walk
+        self.rewrite_positions = {
+            b: [np.flatnonzero(np.isin(option, list(self.rules))) for option in options]
+            for b, options in self.rules.items()
+        }
+        # produced[b][i, j]: how many of rewritable symbol j option i of b contains
+        keys = list(self.rules)
+        self.produced = {
+            b: np.array([[np.count_nonzero(option == j) for j in keys] for option in options])
+            for b, options in self.rules.items()
+        }
+        self.option_lengths = {b: np.array([len(option) for option in options]) for b, options in self.rules.items()}
+        self.choices = []
+
+    def symbol_counts(self, symbols):
+        return {b: int(np.count_nonzero(symbols == b)) for b in self.rules}
+
+    def generate(self, iterations, bit_source=sample_bits):
+        """Append iterations generations of rule choices to the derivation tree."""
+        counts = self.symbol_counts(self.axiom)
+        for level in self.choices:
+            counts = self.next_counts(level)
+        for _ in range(iterations):
+            level = {
+                b: uniform_choices(n, len(self.rules[b]), bit_source).astype(np.uint8)
+                for b, n in counts.items()
+            }
+            self.choices.append(level)
+            counts = self.next_counts(level)
+        return self
+
+    def next_counts(self, level):
+        totals = sum(
+            np.bincount(level[b], minlength=len(self.rules[b])) @ self.produced[b]
+            for b in self.rules
+        )
+        return dict(zip(self.rules, np.atleast_1d(totals).tolist()))
+
+    def __len__(self):
+        """Length of the final generation, computed without expanding it."""
+        length = len(self.axiom)
+        for level in self.choices:
+            for b, chosen in level.items():
+                length += int(self.option_lengths[b][chosen].sum()) - len(chosen)
+        return length
+
+    def walk(self, iterations=None, bit_source=sample_bits, chunk_size=1 << 16):
+        """Yield the final generation depth-first as uint8 chunks of drawing commands.
+
+        With ``iterations`` given, rule choices are drawn on the fly instead of
+        read from the stored tree, so nothing grows with the output length.
+        """
+        if iterations is None:
+            depth = len(self.choices)
+            cursors = [dict.fromkeys(self.rules, 0) for _ in range(depth)]
+
+            def choose(g, b):
+                k = cursors[g][b]
+                cursors[g][b] = k + 1
+                return self.choices[g][b][k]
+        else:
+            depth = iterations
+            pending = {b: iter(()) for b in self.rules}
+
+            def choose(g, b):
+                choice = next(pending[b], None)
+                if choice is None:
+                    pending[b] = iter(uniform_choices(4096, len(self.rules[b]), bit_source).tolist())
+                    choice = next(pending[b])
+                return choice
+
+        axiom_positions = np.flatnonzero(np.isin(self.axiom, list(self.rules)))
+        stack = [(self.axiom, axiom_positions, 0, 0)]  # (symbols, rewrite positions, next slot, generation)
+        out, size = [], 0
+        while stack:
+            symbols, positions, slot, g = stack.pop()
+            start = positions[slot - 1] + 1 if slot else 0
+            if g == depth or slot == len(positions):
+                piece = symbols[start:] if g < depth else symbols
+                out.append(piece)
+                size += len(piece)
+            else:
+                pos = positions[slot]
+                out.append(symbols[start:pos])
+                size += pos - start
+                b = int(symbols[pos])
+                i = choose(g, b)
+                stack.append((symbols, positions, slot + 1, g))
+                stack.append((self.rules[b][i], self.rewrite_positions[b][i], 0, g + 1))
+            if size >= chunk_size:
+                yield np.concatenate(out)
+                out, size = [], 0
+        if out:
+            yield np.concatenate(out)
+
+    def commands(self, **kwargs):
+        """Yield the final generation one character at a time."""
+        for chunk in self.walk(**kwargs):
+            yield from chunk.tobytes().decode("ascii")
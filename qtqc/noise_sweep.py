@@ -0,0 +1,222 @@
+# T1 / T2 / gate-time sweeps for the decoherence studies.
+#
+# The circuit is transpiled once. For every sweep point the thermal
+# relaxation channel is inserted straight after each noisy gate, which is
+# what a NoiseModel would do at run time, so each point becomes its own
+# circuit and the whole grid goes to Aer as one batched job (or as a few
+# batches over a process pool; each spawned worker pays a few seconds of
+# qiskit import, so workers only help on large grids). Results come back as
+# a NumPy structured array with one row per point; pandas.DataFrame(table)
+# turns it into a DataFrame.
+#
+# Circuits made only of single-qubit gates and measurements (the H + id +
+# measure studies) never entangle, so each qubit can be followed on its own
+# as a 2x2 density matrix. Thermal relaxation has a closed form on it:
+#
+#   rho11 -> rho11 * exp(-t/T1)     rho01 -> rho01 * exp(-t/T2)
+#
+# and the outcome distribution is the product of the per-qubit P(1). For
+# those circuits sweep() skips the simulator and returns exact
+# probabilities for every point at once.
+#
+#   python -m qtqc.noise_sweep   # exact path vs Aer; exits with status 1 past the 5-sigma bound
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from qtqc.transpile_cache import cached_transpile
+
+NOISY_GATES = ['id', 'u1', 'u2', 'u3', 'x', 'h']
+
+
+def thermal_noise_model(T1, T2, gate_time=100e-9, gates=NOISY_GATES):
+    """The NoiseModel the temp-*.py scripts use: thermal relaxation after every listed gate."""
+    from qiskit_aer.noise import NoiseModel, thermal_relaxation_error
+    error = thermal_relaxation_error(T1, T2, gate_time)
+    noise_model = NoiseModel()
+    noise_model.add_all_qubit_quantum_error(error, gates)
+    return noise_model
+
+
+def grid(T1s, T2s, gate_times=(100e-9,)):
+    """(N, 3) array of (T1, T2, gate_time) points; physically impossible T2 > 2*T1 are dropped."""
+    points = np.array(list(product(T1s, T2s, gate_times)), dtype=float).reshape(-1, 3)
+    return points[points[:, 1] <= 2 * points[:, 0]]
+
+
+def with_thermal_noise(tqc, T1, T2, gate_time, gates=NOISY_GATES):
+    from qiskit_aer.noise import thermal_relaxation_error
+    channel = thermal_relaxation_error(T1, T2, gate_time).to_instruction()
+    noisy = tqc.copy_empty_like()
+    for inst in tqc.data:
+        noisy.append(inst)
+        if inst.operation.name in gates:
+            for qubit in inst.qubits:
+                noisy.append(channel, [qubit])
+    return noisy
+
+
+def run_points(tqc, points, shots, gates):
+    from qtqc.backends import get_backend
+    backend = get_backend("ideal")
+    circuits = [with_thermal_noise(tqc, *point, gates) for point in points]
+    result = backend.run(circuits, shots=shots).result()
+    return [result.get_counts(i) for i in range(len(circuits))]
+
+
+def is_product_circuit(circuit):
+    """True if no instruction touches more than one qubit and every qubit is measured last, at most once."""
+    measured = set()
+    for inst in circuit.data:
+        name = inst.operation.name
+        if name == "barrier":
+            continue
+        if len(inst.qubits) != 1 or getattr(inst.operation, "condition", None) is not None:
+            return False
+        qubit = inst.qubits[0]
+        if qubit in measured or name == "reset":
+            return False
+        if name == "measure":
+            measured.add(qubit)
+        elif not hasattr(inst.operation, "to_matrix"):
+            return False
+    return True
+
+
+def product_states(tqc, points, gates=NOISY_GATES):
+    """Per-qubit (N, 2, 2) density matrices of a product circuit, and P(1) per measured clbit."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    T1, T2, gate_time = points.T
+    decay = np.exp(-gate_time / T1)
+    dephase = np.exp(-gate_time / T2)
+
+    # One batch of 2x2 density matrices per qubit, all starting in |0>
+    rho = {qubit: np.zeros((len(points), 2, 2), complex) for qubit in tqc.qubits}
+    for state in rho.values():
+        state[:, 0, 0] = 1
+    p_one = {}
+    for inst in tqc.data:
+        name = inst.operation.name
+        if name == "barrier":
+            continue
+        qubit = inst.qubits[0]
+        state = rho[qubit]
+        if name == "measure":
+            p_one[tqc.find_bit(inst.clbits[0]).index] = state[:, 1, 1].real
+            continue
+        u = inst.operation.to_matrix()
+        state = u @ state @ u.conj().T
+        if name in gates:
+            state[:, 1, 1] *= decay
+            state[:, 0, 0] = 1 - state[:, 1, 1]
+            state[:, 0, 1] *= dephase
+            state[:, 1, 0] *= dephase
+        rho[qubit] = state
+    return [rho[qubit] for qubit in tqc.qubits], p_one
+
+
+def exact_probabilities(tqc, points, gates=NOISY_GATES):
+    """(N, 2**clbits) outcome probabilities of a product circuit under thermal relaxation, without shots."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    _, p_one = product_states(tqc, points, gates)
+
+    # Outcome index i has clbit k set when bit k of i is set
+    outcomes = np.arange(2 ** tqc.num_clbits)
+    probs = np.ones((len(points), len(outcomes)))
+    for clbit, p in p_one.items():
+        bit = (outcomes >> clbit) & 1
+        probs *= np.where(bit, p[:, None], 1 - p[:, None])
+    for clbit in set(range(tqc.num_clbits)) - set(p_one):
+        probs *= ((outcomes >> clbit) & 1) == 0
+    return probs
+
+
+def sweep(circuit, points, shots=2000, workers=1, gates=NOISY_GATES, batch_size=256, exact=True):
+    """Outcome probabilities for every (T1, T2, gate_time) point, as one structured array.
+
+    Product circuits are evaluated exactly unless exact=False; everything else is sampled on Aer.
+    circuit may be a QuantumCircuit or a qtqc.lite.Circuit.
+    """
+    from qtqc.backends import get_backend
+    if hasattr(circuit, "to_qiskit"):
+        circuit = circuit.to_qiskit()
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    # optimization_level=0 keeps the id gates that model idle time
+    tqc = cached_transpile(circuit, get_backend("ideal"), optimization_level=0)
+    if exact and is_product_circuit(tqc):
+        return table(points, exact_probabilities(tqc, points, gates))
+
+    batches = [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+    if workers > 1 and len(batches) > 1:
+        # spawn, not fork: a forked child inherits Aer's OpenMP state and hangs
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            n = len(batches)
+            counts = [c for part in pool.map(run_points, [tqc] * n, batches, [shots] * n, [gates] * n) for c in part]
+    else:
+        counts = [c for batch in batches for c in run_points(tqc, batch, shots, gates)]
+
+    probs = np.zeros((len(points), 2 ** circuit.num_clbits))
+    for row, point_counts in enumerate(counts):
+        for outcome, count in point_counts.items():
+            probs[row, int(outcome.replace(" ", ""), 2)] = count / shots
+    return table(points, probs)
+
+
+def table(points, probs):
+    """Structured array with T1, T2, gate_time and one p_<bitstring> column per outcome."""
+    num_bits = int(np.log2(probs.shape[1]))
+    outcomes = [format(i, f"0{num_bits}b") for i in range(probs.shape[1])]
+    dtype = [("T1", float), ("T2", float), ("gate_time", float)] + [(f"p_{o}", float) for o in outcomes]
+    result = np.zeros(len(points), dtype=dtype)
+    result["T1"], result["T2"], result["gate_time"] = points.T
+    for i, outcome in enumerate(outcomes):
+        result[f"p_{outcome}"] = probs[:, i]
+    return result
+
+
+def probabilities_of(table):
+    """(N, 2**n) probability matrix from a sweep table."""
+    names = [name for name in table.dtype.names if name.startswith("p_")]
+    return np.stack([table[name] for name in names], axis=1)
+
+
+def distributions(table):
+    """One {bitstring: probability} dict per row, the shape plot_histogram takes."""
+    names = [name for name in table.dtype.names if name.startswith("p_")]
+    return [{name[2:]: float(row[name]) for name in names} for row in table]
+
+
+def cross_check(circuit, points, shots=100_000):
+    """Largest |exact - sampled| probability over the grid, with the 5-sigma shot-noise bound it should stay under."""
+    exact = probabilities_of(sweep(circuit, points, exact=True))
+    sampled = probabilities_of(sweep(circuit, points, shots=shots, exact=False))
+    bound = 5 * np.sqrt(exact * (1 - exact) / shots).max() + 1 / shots
+    return np.abs(exact - sampled).max(), bound
+
+
+if __name__ == "__main__":
+    import argparse
+    from qiskit import QuantumCircuit
+
+    parser = argparse.ArgumentParser(description="Cross-check the exact product-circuit path against Aer")
+    parser.add_argument("--qubits", type=int, default=3)
+    parser.add_argument("--points", type=int, default=6, help="T1 and T2 values per axis")
+    parser.add_argument("--shots", type=int, default=100_000)
+    args = parser.parse_args()
+
+    qc = QuantumCircuit(args.qubits, args.qubits)
+    qc.h(range(args.qubits))
+    qc.barrier()
+    qc.id(range(args.qubits))
+    qc.x(0)
+    qc.measure(range(args.qubits), range(args.qubits))
+    times = np.geomspace(0.2e-6, 100e-6, args.points)
+    points = grid(times, times)
+
+    deviation, bound = cross_check(qc, points, args.shots)
+    print(f"{len(points)} points: max |exact - Aer| = {deviation:.5f} (5-sigma bound {bound:.5f})")
+    if deviation > bound:
+        raise SystemExit("exact path disagrees with the simulator")
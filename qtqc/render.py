@@ -0,0 +1,124 @@
+# Headless L-system rendering.
+#
+# Turtle state is recovered for the whole command stream at once: headings
+# and positions are cumulative sums of per-command deltas, and every ']'
+# gets a correction delta that cancels whatever happened since its matching
+# '[', which is exactly what popping the turtle stack does. Pairs are
+# corrected innermost level first, one vectorized pass per nesting level.
+import numpy as np
+
+F, PLUS, MINUS, OPEN, CLOSE = (ord(ch) for ch in "F+-[]")
+
+
+def as_commands(commands):
+    """Accept a string, a uint8 array, or an iterable of uint8 chunks (CompactLSystem.walk)."""
+    if isinstance(commands, str):
+        return np.frombuffer(commands.encode("ascii"), dtype=np.uint8)
+    if isinstance(commands, np.ndarray):
+        return commands
+    chunks = list(commands)
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
+
+
+def bracket_pairs(commands):
+    """Matching '[' / ']' positions and their nesting level."""
+    is_open = commands == OPEN
+    is_close = commands == CLOSE
+    depth = np.cumsum(is_open.astype(np.intp) - is_close)
+    opens = np.flatnonzero(is_open)
+    closes = np.flatnonzero(is_close)
+    open_levels = depth[opens]
+    close_levels = depth[closes] + 1
+    if len(opens) != len(closes) or (len(depth) and depth.min() < 0):
+        raise ValueError("unbalanced brackets in L-system commands")
+    # Within one level opens and closes alternate, so the k-th of each match
+    o = np.lexsort((opens, open_levels))
+    c = np.lexsort((closes, close_levels))
+    return opens[o], closes[c], open_levels[o]
+
+
+def scoped_cumsum(deltas, opens, closes, levels):
+    """cumsum(deltas) where each ']' restores the running total saved at its '['."""
+    deltas = deltas.copy()
+    for level in range(int(levels.max()) if len(levels) else 0, 0, -1):
+        sel = levels == level
+        total = np.cumsum(deltas, axis=0)
+        deltas[closes[sel]] -= total[closes[sel] - 1] - total[opens[sel]]
+    return np.cumsum(deltas, axis=0)
+
+
+def segments(commands, angle, length=5.0, heading=90.0):
+    """Return an (N, 2, 2) array of [start, end] points, one per 'F'."""
+    commands = as_commands(commands)
+    opens, closes, levels = bracket_pairs(commands)
+
+    # '+' is turtle.right (clockwise), '-' is turtle.left
+    turns = np.where(commands == PLUS, -angle, 0.0) + np.where(commands == MINUS, angle, 0.0)
+    headings = np.radians(heading + scoped_cumsum(turns, opens, closes, levels))
+
+    steps = commands == F
+    moves = np.zeros((len(commands), 2))
+    moves[steps, 0] = length * np.cos(headings[steps])
+    moves[steps, 1] = length * np.sin(headings[steps])
+    ends = scoped_cumsum(moves, opens, closes, levels)[steps]
+    return np.stack([ends - moves[steps], ends], axis=1)
+
+
+def fit(segs, width, height, margin=0.05):
+    """Scale and translate segments into pixel space (y down), keeping aspect ratio."""
+    points = segs.reshape(-1, 2)
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    span = np.maximum(hi - lo, 1e-9)
+    scale = (1 - 2 * margin) * min(width / span[0], height / span[1])
+    offset = np.array([width, height]) / 2 - scale * (lo + hi) / 2
+    pixels = segs * scale + offset
+    pixels[..., 1] = height - 1 - pixels[..., 1]
+    return pixels
+
+
+def rasterize(segs, width, height, color=(0, 255, 0), background=(0, 0, 0), line_width=1):
+    """Draw all segments into an (height, width, 3) uint8 array in one scatter."""
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = background
+    if len(segs) == 0:
+        return image
+    pixels = fit(segs, width, height)
+    start, delta = pixels[:, 0], pixels[:, 1] - pixels[:, 0]
+    samples = int(np.ceil(np.abs(delta).max())) + 1
+    t = np.linspace(0.0, 1.0, samples)
+    # (N, samples, 2) points along every segment
+    points = np.rint(start[:, None, :] + t[None, :, None] * delta[:, None, :]).astype(np.intp).reshape(-1, 2)
+    for dx in range(line_width):
+        for dy in range(line_width):
+            x = np.clip(points[:, 0] + dx - line_width // 2, 0, width - 1)
+            y = np.clip(points[:, 1] + dy - line_width // 2, 0, height - 1)
+            image[y, x] = color
+    return image
+
+
+def write_svg(segs, path, width, height, color="lime", background="black", line_width=1):
+    pixels = fit(segs, width, height).reshape(-1, 4)
+    with open(path, "w") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">\n'
+            f'<rect width="100%" height="100%" fill="{background}"/>\n'
+            f'<path fill="none" stroke="{color}" stroke-width="{line_width}" d="'
+        )
+        np.savetxt(f, pixels, fmt="M%.1f %.1fL%.1f %.1f", newline="")
+        f.write('"/>\n</svg>\n')
+
+
+def to_hex(rgb):
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+def render(commands, path, size=1024, angle=25, length=5.0, color=(0, 255, 0), background=(0, 0, 0), line_width=1):
+    """Render an L-system command stream to path (.svg, or any image format PIL knows)."""
+    width, height = (size, size) if isinstance(size, int) else size
+    segs = segments(commands, angle, length)
+    if str(path).lower().endswith(".svg"):
+        write_svg(segs, path, width, height, to_hex(color), to_hex(background), line_width)
+    else:
+        from PIL import Image
+        Image.fromarray(rasterize(segs, width, height, color, background, line_width)).save(path)
+    return segs
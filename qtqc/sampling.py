@@ -0,0 +1,67 @@
+# Multi-shot sampling of uniform quantum bits.
+#
+# The transpiled all-H circuit comes from the shared transpile cache,
+# and each call is a single backend.run with memory=True, so asking for a
+# whole generation's worth of bits costs one job instead of one per symbol.
+import numpy as np
+
+from qtqc.transpile_cache import cached_transpile
+
+def default_backend():
+    from qtqc.backends import get_backend
+    return get_backend("ideal")
+
+
+def uniform_circuit(num_qubits):
+    from qiskit import QuantumCircuit
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    qc.h(range(num_qubits))
+    qc.measure(range(num_qubits), range(num_qubits))
+    return qc
+
+
+def memory_to_bits(memory):
+    """Per-shot memory strings -> (shots, width) uint8 array, column i = qubit i."""
+    joined = "".join(memory).replace(" ", "")  # register separators
+    raw = np.frombuffer(joined.encode("ascii"), dtype=np.uint8) - ord("0")
+    return raw.reshape(len(memory), -1)[:, ::-1]
+
+
+def sample_bits(num_bits, backend=None, num_qubits=16):
+    """Return num_bits measured bits as a flat uint8 array from one multi-shot run."""
+    backend = backend or default_backend()
+    tqc = cached_transpile(uniform_circuit(num_qubits), backend)
+    shots = max(1, -(-num_bits // num_qubits))
+    result = backend.run(tqc, shots=shots, memory=True).result()
+    return memory_to_bits(result.get_memory()).reshape(-1)[:num_bits]
+
+
+def stream_bits(bit_source=sample_bits, chunk=1024):
+    """Endless bit generator that refills from bit_source(chunk) when drained."""
+    while True:
+        for bit in bit_source(chunk).tolist():
+            yield bit
+
+
+class BitBlock:
+    """Pre-sampled bits handed out in order, topped up by one more run when drained.
+
+    Instances are callable like sample_bits, so they can be passed anywhere a
+    bit_source is expected.
+    """
+
+    def __init__(self, size=1 << 20, bit_source=sample_bits):
+        self.size = size
+        self.bit_source = bit_source
+        self.bits = bit_source(size)
+        self.pos = 0
+
+    def __call__(self, num_bits):
+        if self.pos + num_bits > len(self.bits):
+            rest = self.bits[self.pos:]
+            fresh = self.bit_source(max(self.size, num_bits - len(rest)))
+            self.bits = np.concatenate([rest, fresh])
+            self.pos = 0
+        out = self.bits[self.pos:self.pos + num_bits]
+        self.pos += num_bits
+        return out
@@ -0,0 +1,22 @@
+# Unix socket paths shared by the long-running services.
+#
+# A socket file outlives a server that crashed, so servers clear a leftover
+# path before binding, but only once a connect() proves nobody is
+# listening: unlinking a live server's path would silently orphan its
+# clients.
+import errno
+import os
+import socket
+
+
+def remove_stale_socket(path):
+    """Unlink a socket left by a dead server; refuse to take over a live one."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            os.unlink(path)  # stale socket from a previous run
+            return
+    raise OSError(errno.EADDRINUSE, f"a server is already listening on {path}")
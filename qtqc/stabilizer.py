@@ -0,0 +1,191 @@
+# Stabilizer-tableau sampling for Clifford circuits.
+#
+# Circuits built from H, S, X, Y, Z, CX, CZ and SWAP followed by Z-basis
+# measurements are simulated with the Aaronson-Gottesman (CHP) tableau:
+# 2n rows of n-qubit Paulis, so memory grows as n^2 bits instead of the 2^n
+# amplitudes of a statevector, and graph states with hundreds of qubits are
+# cheap. The tableau is run once with each sign kept as an affine (GF(2))
+# function of the random measurement outcomes, so every measured bit comes
+# out as
+#
+#   bit = const XOR (parity of some of the random outcomes)
+#
+# and any number of shots is one matrix product of uniform random bits with
+# that map. Deterministic outcomes (e.g. the correlated bits of a GHZ state)
+# fall out of the same map with no extra random bits.
+#
+#   python -m qtqc.stabilizer   # compare against Aer's stabilizer method
+import numpy as np
+
+CLIFFORD_GATES = {"id", "barrier", "h", "s", "sdg", "x", "y", "z", "cx", "cz", "swap", "measure"}
+
+
+def g(x1, z1, x2, z2):
+    """Exponent of i picked up when multiplying Pauli (x1, z1) by (x2, z2), per qubit (CHP's g)."""
+    x1, z1, x2, z2 = (np.asarray(a, dtype=np.int8) for a in (x1, z1, x2, z2))
+    return np.where(x1 & z1, z2 - x2,
+                    np.where(x1, z2 * (2 * x2 - 1),
+                             np.where(z1, x2 * (1 - 2 * z2), 0)))
+
+
+class Tableau:
+    """CHP tableau whose row signs are affine in the random measurement outcomes.
+
+    Rows 0..n-1 are destabilizers and n..2n-1 stabilizers, as bit matrices
+    xs and zs. r[:, 0] is the constant part of each sign and r[:, j] its
+    dependence on the j-th random outcome.
+    """
+
+    def __init__(self, num_qubits, max_random=None):
+        n = num_qubits
+        self.n = n
+        self.xs = np.zeros((2 * n, n), dtype=bool)
+        self.zs = np.zeros((2 * n, n), dtype=bool)
+        self.xs[:n] = np.eye(n, dtype=bool)  # destabilizers X_i
+        self.zs[n:] = np.eye(n, dtype=bool)  # stabilizers Z_i of |0...0>
+        self.r = np.zeros((2 * n, 1 + (n if max_random is None else max_random)), dtype=bool)
+        self.num_random = 0
+
+    def h(self, a):
+        self.r[:, 0] ^= self.xs[:, a] & self.zs[:, a]
+        self.xs[:, a], self.zs[:, a] = self.zs[:, a].copy(), self.xs[:, a].copy()
+
+    def s(self, a):
+        self.r[:, 0] ^= self.xs[:, a] & self.zs[:, a]
+        self.zs[:, a] ^= self.xs[:, a]
+
+    def sdg(self, a):
+        for _ in range(3):
+            self.s(a)
+
+    def x(self, a):
+        self.r[:, 0] ^= self.zs[:, a]
+
+    def y(self, a):
+        self.r[:, 0] ^= self.xs[:, a] ^ self.zs[:, a]
+
+    def z(self, a):
+        self.r[:, 0] ^= self.xs[:, a]
+
+    def cx(self, a, b):
+        self.r[:, 0] ^= self.xs[:, a] & self.zs[:, b] & ~(self.xs[:, b] ^ self.zs[:, a])
+        self.xs[:, b] ^= self.xs[:, a]
+        self.zs[:, a] ^= self.zs[:, b]
+
+    def cz(self, a, b):
+        self.h(b)
+        self.cx(a, b)
+        self.h(b)
+
+    def swap(self, a, b):
+        self.cx(a, b)
+        self.cx(b, a)
+        self.cx(a, b)
+
+    def rowsum(self, rows, p):
+        """Multiply row p into each of rows (CHP rowsum, vectorized over rows)."""
+        phase = g(self.xs[p], self.zs[p], self.xs[rows], self.zs[rows]).sum(axis=1) % 4
+        self.r[rows] ^= self.r[p]
+        self.r[rows, 0] ^= phase == 2
+        self.xs[rows] ^= self.xs[p]
+        self.zs[rows] ^= self.zs[p]
+
+    def measure(self, a):
+        """Z-basis outcome of qubit a as an affine row over (1, random outcomes...)."""
+        n = self.n
+        anticommuting = np.flatnonzero(self.xs[n:, a])
+        if anticommuting.size:
+            # Random outcome: a fresh uniform bit becomes the sign of Z_a
+            p = anticommuting[0] + n
+            rows = np.flatnonzero(self.xs[:, a])
+            self.rowsum(rows[rows != p], p)
+            self.xs[p - n], self.zs[p - n], self.r[p - n] = self.xs[p], self.zs[p], self.r[p]
+            self.xs[p] = False
+            self.zs[p] = False
+            self.zs[p, a] = True
+            self.r[p] = False
+            self.num_random += 1
+            self.r[p, self.num_random] = True
+            return self.r[p].copy()
+
+        # Determined: Z_a is the product of the stabilizers paired with destabilizers that have X on a.
+        # Multiply them in order, tracking the running product's Pauli part with a prefix XOR.
+        rows = np.flatnonzero(self.xs[:n, a]) + n
+        x_before = np.bitwise_xor.accumulate(self.xs[rows], axis=0) ^ self.xs[rows]
+        z_before = np.bitwise_xor.accumulate(self.zs[rows], axis=0) ^ self.zs[rows]
+        phases = g(self.xs[rows], self.zs[rows], x_before, z_before).sum(axis=1) % 4
+        out = np.bitwise_xor.reduce(self.r[rows], axis=0)
+        out[0] ^= np.count_nonzero(phases == 2) & 1
+        return out
+
+
+def outcome_map(circuit):
+    """(num_clbits, 1 + num_random) bool matrix of affine outcomes, or None if circuit is not Clifford.
+
+    circuit is a qtqc.lite.Circuit; unmeasured clbits are always 0.
+    """
+    if any(name not in CLIFFORD_GATES for name, _, _ in circuit.ops):
+        return None
+    num_measurements = sum(name == "measure" for name, _, _ in circuit.ops)
+    tableau = Tableau(circuit.num_qubits, max_random=num_measurements)
+    outcomes = np.zeros((circuit.num_clbits, 1 + num_measurements), dtype=bool)
+    for name, qubits, params in circuit.ops:
+        if name == "measure":
+            outcomes[params[0]] = tableau.measure(qubits[0])
+        elif name not in ("id", "barrier"):
+            getattr(tableau, name)(*qubits)
+    return outcomes[:, :1 + tableau.num_random]
+
+
+def sample_clifford(circuit, shots=1, rng=None, bit_source=None, outcomes=None):
+    """(shots, num_clbits) uint8 measured bits of a Clifford circuit, column i = clbit i.
+
+    Needs only one uniform bit per random outcome per shot, drawn from
+    bit_source (see qtqc.entropy) when given, else from rng.
+    """
+    outcomes = outcome_map(circuit) if outcomes is None else outcomes
+    if outcomes is None:
+        raise ValueError("circuit has non-Clifford gates")
+    num_random = outcomes.shape[1] - 1
+    if bit_source is not None:
+        random = np.asarray(bit_source(shots * num_random), dtype=np.uint8).reshape(shots, num_random)
+    else:
+        random = (rng or np.random.default_rng()).integers(0, 2, (shots, num_random), dtype=np.uint8)
+    parity = random.astype(np.int32) @ outcomes[:, 1:].T.astype(np.int32)
+    return ((parity & 1) ^ outcomes[:, 0]).astype(np.uint8)
+
+
+def random_clifford_circuit(num_qubits, depth, rng):
+    from qtqc.lite import Circuit
+    qc = Circuit(num_qubits, num_qubits)
+    for _ in range(depth):
+        gate = rng.choice(["h", "s", "sdg", "x", "y", "z", "cx", "cz", "swap"])
+        if gate in ("cx", "cz", "swap"):
+            a, b = rng.choice(num_qubits, 2, replace=False)
+            qc.append(gate, [int(a), int(b)])
+        else:
+            qc.append(gate, [int(rng.integers(num_qubits))])
+    return qc.measure(range(num_qubits), range(num_qubits))
+
+
+def cross_check(num_circuits=20, num_qubits=5, depth=40, shots=20000, seed=0):
+    """Largest total-variation distance between tableau samples and Aer's stabilizer method."""
+    from qtqc.backends import get_backend
+    from qtqc.decode import as_bits
+    backend = get_backend("stabilizer")
+    rng = np.random.default_rng(seed)
+    weights = 1 << np.arange(num_qubits)
+    worst = 0.0
+    for _ in range(num_circuits):
+        qc = random_clifford_circuit(num_qubits, depth, rng)
+        ours = sample_clifford(qc, shots, rng) @ weights
+        memory = backend.run(qc.to_qiskit(), shots=shots, memory=True).result().get_memory()
+        theirs = as_bits(memory) @ weights
+        p = np.bincount(ours, minlength=1 << num_qubits) / shots
+        q = np.bincount(theirs, minlength=1 << num_qubits) / shots
+        worst = max(worst, 0.5 * np.abs(p - q).sum())
+    return worst
+
+
+if __name__ == "__main__":
+    print(f"max total variation vs Aer stabilizer: {cross_check():.4f} (two-sample noise alone is ~0.02)")
@@ -0,0 +1,110 @@
+# Content-keyed transpile cache.
+#
+# Transpiling against a noisy device model (layout, routing, basis
+# translation) costs far more than simulating a few qubits, and the scripts
+# keep asking for the same circuits. Entries are keyed on the circuit's
+# structure, the backend name and the optimization level, kept in an LRU,
+# and optionally mirrored to disk as QPY so later processes start warm.
+import hashlib
+import os
+from collections import OrderedDict
+
+
+def backend_name(backend):
+    name = backend.name
+    return name() if callable(name) else name  # BackendV1 has name(), V2 a property
+
+
+def circuit_fingerprint(circuit):
+    """Hash of everything transpile looks at or keeps: sizes, phase, registers, layout and each instruction."""
+    h = hashlib.sha256()
+    h.update(f"{circuit.num_qubits}/{circuit.num_clbits}/{circuit.global_phase}".encode())
+    # Register names and which bits they hold survive transpilation (result.data.<creg> reads them)
+    for reg in circuit.qregs + circuit.cregs:
+        h.update(f"|{type(reg).__name__}:{reg.name}:{[circuit.find_bit(b).index for b in reg]}".encode())
+    if circuit.layout is not None:
+        h.update(f"|layout{circuit.layout.initial_index_layout()}".encode())
+    for inst in circuit.data:
+        op = inst.operation
+        qubits = [circuit.find_bit(q).index for q in inst.qubits]
+        clbits = [circuit.find_bit(c).index for c in inst.clbits]
+        h.update(f"|{op.name}{op.params}{qubits}{clbits}".encode())
+    return h.hexdigest()
+
+
+class TranspileCache:
+    def __init__(self, maxsize=128, disk_dir=None):
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def key(self, circuit, backend, optimization_level=None, **options):
+        parts = [circuit_fingerprint(circuit), backend_name(backend), str(optimization_level)]
+        parts += [f"{k}={options[k]!r}" for k in sorted(options)]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def transpile(self, circuit, backend, optimization_level=None, **options):
+        """Like qiskit.transpile for a single circuit, but served from cache when possible."""
+        key = self.key(circuit, backend, optimization_level, **options)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        tqc = self.load(key)
+        if tqc is not None:
+            self.disk_hits += 1
+        else:
+            from qiskit import transpile
+            self.misses += 1
+            tqc = transpile(circuit, backend, optimization_level=optimization_level, **options)
+            self.store(key, tqc)
+
+        self.entries[key] = tqc
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return tqc
+
+    def path(self, key):
+        return os.path.join(self.disk_dir, key + ".qpy")
+
+    def load(self, key):
+        if not self.disk_dir or not os.path.exists(self.path(key)):
+            return None
+        from qiskit import qpy
+        try:
+            with open(self.path(key), "rb") as f:
+                return qpy.load(f)[0]
+        except Exception:
+            return None  # unreadable or written by another qiskit version: re-transpile
+
+    def store(self, key, tqc):
+        if not self.disk_dir:
+            return
+        from qiskit import qpy
+        tmp = self.path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            qpy.dump(tqc, f)
+        os.replace(tmp, self.path(key))
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self.entries)}
+
+    def clear(self):
+        self.entries.clear()
+
+
+_default_cache = TranspileCache(disk_dir=os.environ.get("QTQC_TRANSPILE_CACHE"))
+
+
+def cached_transpile(circuit, backend, optimization_level=None, **options):
+    return _default_cache.transpile(circuit, backend, optimization_level, **options)
+
+
+def cache_stats():
+    return _default_cache.stats()
@@ -0,0 +1,199 @@
+# Shared, threaded video decoding and per-stage latency stats for the superposition player.
+import threading
+import time
+from collections import deque
+
+import cv2
+
+
+class RollingMean:
+    def __init__(self, window=120):
+        self.values = deque(maxlen=window)
+
+    def add(self, value):
+        self.values.append(value)
+
+    def mean(self):
+        return sum(self.values) / len(self.values) if self.values else 0.0
+
+
+class LatencyStats:
+    """Rolling per-stage timings in milliseconds, e.g. decode / blend / present."""
+
+    def __init__(self, window=120):
+        self.window = window
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, ms):
+        with self.lock:
+            self.stages.setdefault(stage, RollingMean(self.window)).add(ms)
+
+    def mean(self, stage):
+        with self.lock:
+            return self.stages[stage].mean() if stage in self.stages else 0.0
+
+    def report(self):
+        with self.lock:
+            return " | ".join(f"{stage} {mean.mean():.1f} ms" for stage, mean in self.stages.items())
+
+
+class CaptureSource(threading.Thread):
+    """One decoder per file, decoding ahead into a ring of reused frame buffers.
+
+    Frames are numbered by a running sequence number (seq) that keeps
+    counting when the file loops at EOF. Views read the ring by seq, and the
+    decoder only moves ahead while every view has room, so a frame is decoded
+    once no matter how many views read it. A view that stops reading holds
+    the decoder back, which is how a source pauses; close() views that are
+    no longer needed.
+    """
+
+    def __init__(self, path, cache_frames=8, stats=None):
+        super().__init__(daemon=True, name=f"decode:{path}")
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.slots = [None] * cache_frames
+        self.seq = 0  # seq of the next frame to decode
+        self.views = []
+        self.pending_seek = None
+        self.stopped = False
+        self.failed = False
+        self.stats = stats
+        self.cond = threading.Condition()
+
+    def has_work(self):
+        if self.stopped or self.pending_seek is not None:
+            return True
+        cursors = [view.cursor for view in self.views if view.cursor is not None]
+        # Keep one slot spare: the frame a view read last must stay valid
+        return bool(cursors) and self.seq - min(cursors) < len(self.slots) - 1
+
+    def run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(self.has_work)
+                if self.stopped:
+                    break
+                seek, self.pending_seek = self.pending_seek, None
+                if seek is not None:
+                    for view in self.views:
+                        view.cursor = self.seq
+                    # Views may still hold the frames they read before the
+                    # seek; decode from here on into fresh buffers
+                    self.slots = [None] * len(self.slots)
+                slot = self.seq % len(self.slots)
+            if seek is not None:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, seek)
+
+            start = time.perf_counter()
+            ret, frame = self.cap.read(self.slots[slot])
+            if not ret:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self.cap.read(self.slots[slot])
+            if self.stats is not None:
+                self.stats.add("decode", (time.perf_counter() - start) * 1000)
+
+            with self.cond:
+                if not ret:
+                    self.failed = True  # unreadable source; views return None
+                    self.cond.notify_all()
+                    break
+                self.slots[slot] = frame
+                self.seq += 1
+                self.cond.notify_all()
+        self.cap.release()
+
+    def view(self):
+        with self.cond:
+            view = StreamView(self)
+            self.views.append(view)
+            self.cond.notify_all()
+        return view
+
+    def seek(self, frame_no):
+        """Move the shared decode position; every view of this source continues from there."""
+        with self.cond:
+            self.pending_seek = frame_no
+            for view in self.views:
+                view.cursor = None
+            self.cond.notify_all()
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+
+
+class StreamView:
+    """A read cursor over a shared CaptureSource.
+
+    A frame returned by read() is the decoder's own buffer: treat it as
+    read-only, and it stays valid until this view's next read(), including
+    across seek() and CapturePool.rewind().
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.cursor = source.seq
+
+    def ready(self):
+        return self.source.failed or (self.cursor is not None and self.cursor < self.source.seq)
+
+    def read(self, timeout=1.0):
+        """Next frame, or None if the source stalls or fails."""
+        source = self.source
+        with source.cond:
+            if not source.cond.wait_for(self.ready, timeout) or source.failed:
+                return None
+            frame = source.slots[self.cursor % len(source.slots)]
+            self.cursor += 1
+            source.cond.notify_all()
+        return frame
+
+    def seek(self, frame_no):
+        self.source.seek(frame_no)
+
+    def close(self):
+        with self.source.cond:
+            self.source.views.remove(self)
+            self.source.cond.notify_all()
+
+
+class CapturePool:
+    """Owns exactly one source per video and releases them all on close().
+
+    With frame_cache_dir set, each video is decoded once into a memory-mapped
+    frame file (see qtqc.framecache) and played back from it without decoding.
+    """
+
+    def __init__(self, paths, cache_frames=8, stats=None, frame_cache_dir=None, size=None):
+        if frame_cache_dir:
+            from qtqc.framecache import MappedSource
+            self.sources = {key: MappedSource(path, frame_cache_dir, size) for key, path in paths.items()}
+        else:
+            self.sources = {key: CaptureSource(path, cache_frames, stats) for key, path in paths.items()}
+        for source in self.sources.values():
+            source.start()
+
+    def view(self, key):
+        return self.sources[key].view()
+
+    def rewind(self):
+        for source in self.sources.values():
+            source.seek(0)
+
+    def close(self):
+        for source in self.sources.values():
+            source.stop()
+        for source in self.sources.values():
+            source.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
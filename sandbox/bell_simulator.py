@@ -1,7 +1,9 @@
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.backends import get_backend
 
 # Step 1: Create a quantum circuit with 2 qubits and 2 classical bits
 qc = QuantumCircuit(2, 2)
@@ -16,12 +18,15 @@ qc.cx(0, 1)
 qc.measure([0, 1], [0, 1])
 
 # Step 5: Simulate the circuit using the qasm_simulator
-backend = Aer.get_backend('aer_simulator')
+backend = get_backend('ideal')
 tqc = transpile(qc, backend)
 result = backend.run(tqc, shots=1000).result()
 counts = result.get_counts()
 
 # Step 6: Display the result
 print("Measurement counts:", counts)
+# Plotting imports are deferred until the counts are already printed
+from qiskit.visualization import plot_histogram
+import matplotlib.pyplot as plt
 plot_histogram(counts)
 plt.show()
@@ -1,5 +1,9 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.entropy import configured_source
+from qtqc.lite import Circuit, sample_array
 
 # Step 1: Define your creative tree branches
 tree = {
@@ -9,21 +13,20 @@ tree = {
 }
 
 # Step 2: Create 3-qubit quantum circuit (GHZ or Hadamard superposition)
-qc = QuantumCircuit(3, 3)
+qc = Circuit(3, 3)
 qc.h([0, 1, 2])  # Independent randomness (change to GHZ for correlated)
 qc.measure([0, 1, 2], [0, 1, 2])
 
-# Step 3: Simulate and get bitstring
-backend = Aer.get_backend('aer_simulator')
-tqc = transpile(qc, backend)
-result = backend.run(tqc, shots=1).result()
-bitstring = list(result.get_counts().keys())[0]  # e.g., '101'
-print("Bitstring:", bitstring[::-1])
+# Step 3: Simulate and get the measured bits, qubit 0 first
+# (all-H measurement is sampled without qiskit, from QTQC_ENTROPY when set;
+# a GHZ variant is sampled from its stabilizer tableau, still without qiskit)
+bits = sample_array(qc, bit_source=configured_source())[0].tolist()  # e.g., [1, 0, 1]
+print("Bitstring:", "".join(map(str, bits)))
 
 # Step 4: Traverse the tree
 description = []
-for i, bit in enumerate(reversed(bitstring)):
-    choice = tree[i][int(bit)]
+for i, bit in enumerate(bits):
+    choice = tree[i][bit]
     description.append(choice)
 
 final_prompt = ", ".join(description)
@@ -1,11 +1,19 @@
 from qiskit import QuantumCircuit
-from qiskit import transpile
 from qiskit.visualization import plot_histogram
 from qiskit_ibm_runtime import SamplerV2
-from qiskit_ibm_runtime.fake_provider import FakeManilaV2
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.backends import get_backend
+from qtqc.transpile_cache import TranspileCache
+
+# Transpiled circuits persist across runs, keyed on circuit, backend and optimization level
+# (next to this script, so the cache is the same from any working directory)
+cache = TranspileCache(disk_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".transpile-cache"))
  
-# Get a fake backend from the fake provider
-backend = FakeManilaV2()
+# Shared fake backend from the registry (FakeManilaV2)
+backend = get_backend('fake_manila')
  
 # Create a simple circuit
 circuit = QuantumCircuit(3)
@@ -18,7 +26,8 @@ circuit.draw('mpl', style="iqp", filename="ideal-circuit.png")
 
 # Transpile the ideal circuit to a circuit that can be
 # directly executed by the backend
-transpiled_circuit = transpile(circuit, backend)
+transpiled_circuit = cache.transpile(circuit, backend)
+print("Transpile cache:", cache.stats())
 transpiled_circuit.draw('mpl', style="iqp", filename="transpiled-circuit.png")
 
 # Run the transpiled circuit using the simulated fake backend
@@ -1,22 +1,24 @@
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
-from qiskit.visualization import plot_histogram
 from PIL import Image, ImageEnhance
-import matplotlib.pyplot as plt
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.animation import save_animation
+from qtqc.amplitudes import interference_circuit, probabilities, sample_outcome, weights_for
+from qtqc.blend import Blender
 
 # === Step 1: Create Quantum Circuit ===
-qc = QuantumCircuit(2, 2)
-qc.h([0, 1])             # Put both qubits in superposition
-qc.measure([0, 1], [0, 1])  # Measure into classical bits
+# H-CP(theta)-H on 2 qubits: theta = pi is the equal superposition of H on
+# both qubits, other angles weight the four images by interference
+theta = np.pi
+qc = interference_circuit(theta)
+probs = probabilities(qc)  # |amplitude|^2 per basis state
+print("Amplitude weights:", np.round(probs, 3))
 
 # === Step 2: Simulate the circuit ===
-backend = Aer.get_backend('qasm_simulator')
-job = backend.run(qc, shots=1)  # 1 shot to simulate single collapse
-result = job.result()
-counts = result.get_counts()
-
-# Get the single outcome (e.g. '10')
-outcome = list(counts.keys())[0]
+# Get the single outcome (e.g. '10') from 1 shot to simulate single collapse
+outcome = sample_outcome(qc)
 print("Measured:", outcome)
 
 # === Step 3: Load and blend images ===
@@ -31,43 +33,34 @@ paths = {
 # Load images as PIL.Image
 images = {k: Image.open(paths[k]).convert("RGBA") for k in paths}
 
-# Create a blended superposition preview (equal weights)
-blend = Image.blend(
-    Image.blend(images["00"], images["01"], alpha=0.5),
-    Image.blend(images["10"], images["11"], alpha=0.5),
-    alpha=0.5
-)
+# Create a blended superposition preview weighted by |amplitude|^2
+sources = [np.asarray(images[k]) for k in paths]
+blend = Image.fromarray(Blender(sources[0].shape, buffers=1).blend(sources, weights_for(paths, probs)))
 
-# === Step 4: Animate and export as GIF ===
-frames = []
+# === Step 4: Animate and export (streamed: frames are encoded as they are made) ===
+output_path = "superposition_animation.gif"  # .gif, .png (APNG) or .mp4
+frame_ms = 100         # ms per frame
 transition_steps = 30  # Number of frames for each transition
 hold_frames = 30       # Hold each state for this many frames
 
-for outcome in ["00", "01", "10", "11"]:
-    # Hold the blend for a few frames
-    for _ in range(hold_frames):
-        frames.append(blend.copy())
-    # Crossfade from blend to outcome image
-    for i in range(transition_steps + 1):
-        alpha = i / transition_steps
-        frame = Image.blend(blend, images[outcome], alpha)
-        frames.append(frame)
-    # Hold the outcome image for a few frames
-    for _ in range(hold_frames):
-        frames.append(images[outcome].copy())
+def animation_frames():
+    """Yield (frame, duration_ms); a hold is one frame shown hold_frames times as long."""
+    for outcome in ["00", "01", "10", "11"]:
+        # Hold the blend
+        yield blend, hold_frames * frame_ms
+        # Crossfade from blend to outcome image
+        for i in range(transition_steps + 1):
+            alpha = i / transition_steps
+            yield Image.blend(blend, images[outcome], alpha), frame_ms
+        # Hold the outcome image
+        yield images[outcome], hold_frames * frame_ms
 
-# Save as GIF
-frames[0].save(
-    "superposition_animation.gif",
-    save_all=True,
-    append_images=frames[1:],
-    duration=100,  # ms per frame
-    loop=0
-)
-
-print("GIF saved as superposition_animation.gif")
+count = save_animation(output_path, animation_frames(), frame_duration=frame_ms)
+print(f"Saved {output_path} ({count} frames)")
 
 # === Step 4: Show the result ===
+import matplotlib.pyplot as plt  # only needed once the animation is saved
+
 fig, axs = plt.subplots(1, 2, figsize=(10, 5))
 axs[0].imshow(blend)
 axs[0].set_title("Superposition Blend")
@@ -1,20 +1,22 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-import turtle
 import random
+import os
+import sys
 
-# Quantum randomness function
-def quantum_bitstring(num_qubits=3):
-    qc = QuantumCircuit(num_qubits, num_qubits)
-    qc.h(range(num_qubits))
-    qc.measure(range(num_qubits), range(num_qubits))
-    
-    backend = Aer.get_backend('aer_simulator')
-    tqc = transpile(qc, backend)
-    result = backend.run(tqc, shots=1).result()
-    counts = result.get_counts()
-    bitstring = list(counts.keys())[0]
-    return bitstring
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.dice import UniformDecoder
+from qtqc.entropy import configured_source
+from qtqc.lsystem import expand_generation
+from qtqc.render import render as render_commands
+from qtqc.sampling import sample_bits, stream_bits
+
+# Quantum randomness: one multi-shot run returns a whole block of bits
+# (or another source, e.g. QTQC_ENTROPY=gmc+von_neumann)
+bit_source = configured_source(sample_bits)
+
+def quantum_bits(num_bits):
+    return bit_source(num_bits)
+
+decoder = UniformDecoder(stream_bits(quantum_bits, chunk=64))
 
 # L-System with quantum rule selection
 class QuantumLSystem:
@@ -27,21 +29,18 @@ class QuantumLSystem:
 
     def generate(self, iterations):
         for _ in range(iterations):
-            next_string = ""
-            for ch in self.current:
-                if ch in self.rules:
-                    bitstring = quantum_bitstring()
-                    choice_index = int(bitstring, 2) % len(self.rules[ch])
-                    next_string += self.rules[ch][choice_index]
-                else:
-                    next_string += ch
-            self.current = next_string
-            
+            # All rule choices for this generation come from one multi-shot run
+            self.current = expand_generation(self.current, self.rules, quantum_bits)
+
             # Use quantum randomness to vary the angle
-            angle_bits = quantum_bitstring(2)
-            self.angle = self.angle_choices[int(angle_bits, 2) % len(self.angle_choices)]
+            self.angle = decoder.choice(self.angle_choices)
+
+    def render(self, path, size=1024, length=5):
+        """Headless: rasterize (or write SVG) in bulk instead of driving turtle."""
+        render_commands(self.current, path, size, angle=self.angle, length=length, color=(0, 255, 0))
 
     def draw(self, length=5):
+        import turtle  # needs tkinter; render() stays headless
         stack = []
         turtle.speed(0)
         turtle.bgcolor('black')
@@ -83,4 +82,5 @@ angle_choices = [20, 25, 30, 35]
 
 qls = QuantumLSystem(axiom="F", rules=rules, angle_choices=angle_choices)
 qls.generate(iterations=4)
-qls.draw(length=10)
+qls.render("lsystem.png", size=1024, length=10)
+print("Saved lsystem.png")
@@ -1,23 +1,22 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit.test.mock import FakeLima
-import turtle
-import time
+import os
+import sys
 
-# Use a fake backend for simulation
-backend = FakeLima()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.backends import get_backend
+from qtqc.dice import UniformDecoder
+from qtqc.lsystem import expand_generation
+from qtqc.render import render as render_commands
+from qtqc.sampling import sample_bits, stream_bits
+from qtqc.transpile_cache import cache_stats
 
-# Generate quantum bitstring using fake backend
-def quantum_bitstring_real(num_qubits=3):
-    qc = QuantumCircuit(num_qubits, num_qubits)
-    qc.h(range(num_qubits))  # Put qubits in superposition
-    qc.measure(range(num_qubits), range(num_qubits))
+# Use a fake backend for simulation (FakeLimaV2; qiskit.test.mock is gone)
+backend = get_backend('fake_lima')
 
-    transpiled = transpile(qc, backend)
-    job = backend.run(transpiled, shots=1)
-    result = job.result()
-    counts = result.get_counts()
-    bitstring = list(counts.keys())[0]
-    return bitstring
+# Generate a block of quantum bits using fake backend (one multi-shot job)
+def quantum_bits_real(num_bits):
+    return sample_bits(num_bits, backend=backend, num_qubits=3)
+
+decoder = UniformDecoder(stream_bits(quantum_bits_real, chunk=64))
 
 # L-System class (same as before)
 class QuantumLSystem:
@@ -30,20 +29,17 @@ class QuantumLSystem:
 
     def generate(self, iterations):
         for _ in range(iterations):
-            next_string = ""
-            for ch in self.current:
-                if ch in self.rules:
-                    bitstring = quantum_bitstring_real()
-                    choice_index = int(bitstring, 2) % len(self.rules[ch])
-                    next_string += self.rules[ch][choice_index]
-                else:
-                    next_string += ch
-            self.current = next_string
+            # All rule choices for this generation come from one multi-shot run
+            self.current = expand_generation(self.current, self.rules, quantum_bits_real)
             
-            angle_bits = quantum_bitstring_real(2)
-            self.angle = self.angle_choices[int(angle_bits, 2) % len(self.angle_choices)]
+            self.angle = decoder.choice(self.angle_choices)
+
+    def render(self, path, size=1024, length=5):
+        """Headless: rasterize (or write SVG) in bulk instead of driving turtle."""
+        render_commands(self.current, path, size, angle=self.angle, length=length, color=(0, 255, 255))
 
     def draw(self, length=5):
+        import turtle  # needs tkinter; render() stays headless
         stack = []
         turtle.speed(0)
         turtle.bgcolor('black')
@@ -84,4 +80,6 @@ angle_choices = [20, 25, 30, 35]
 
 qls = QuantumLSystem(axiom="F", rules=rules, angle_choices=angle_choices)
 qls.generate(iterations=3)
-qls.draw(length=7)
+qls.render("lsystem_ibm.png", size=1024, length=7)
+print("Saved lsystem_ibm.png")
+print("Transpile cache:", cache_stats())
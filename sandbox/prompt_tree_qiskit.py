@@ -1,5 +1,10 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.entropy import configured_source
+from qtqc.decode import decode
+from qtqc.lite import Circuit, sample_array
 
 # Each prompt node has 2 qubits → 4 options per node
 prompt_graph = {
@@ -8,43 +13,43 @@ prompt_graph = {
     2: ["Mood: serene", "Mood: anxious", "Mood: euphoric", "Mood: uncanny"]
 }
 
-def build_graph_state_multibit():
-    qc = QuantumCircuit(6, 6)  # 2 qubits per node × 3 nodes
+QUBITS_PER_NODE = 2
+
+# Linked concepts: qubit j of one node is entangled with qubit j of the other
+edges = [(0, 1), (1, 2)]
+
+def build_graph_state_multibit(num_nodes=len(prompt_graph), edges=edges, k=QUBITS_PER_NODE):
+    n = num_nodes * k
+    qc = Circuit(n, n)  # k qubits per node
 
     # Step 1: Superpose all qubits
-    for i in range(6):
-        qc.h(i)
+    qc.h(range(n))
 
     # Step 2: Graph entanglement (entangle pairs to encode coherence)
-    qc.cz(0, 2)
-    qc.cz(2, 4)
-    qc.cz(1, 3)
-    qc.cz(3, 5)
+    for a, b in edges:
+        for j in range(k):
+            qc.cz(a * k + j, b * k + j)
 
     # Step 3: Measure all qubits
-    qc.measure(range(6), range(6))
+    qc.measure(range(n), range(n))
     return qc
 
-def interpret_multi_qubit_prompt(bitstring):
-    prompt_parts = []
-    for node_idx in range(3):
-        qubit_a = int(bitstring[2*node_idx + 1])  # MSB
-        qubit_b = int(bitstring[2*node_idx])      # LSB
-        value = (qubit_a << 1) | qubit_b          # Binary to int
-        prompt_parts.append(prompt_graph[node_idx][value])
-    return ", ".join(prompt_parts)
+def node_layout(num_nodes, k=QUBITS_PER_NODE):
+    """Node i reads qubits k*i (LSB) .. k*i + k - 1 (MSB)."""
+    return ", ".join(f"node{i} = q{i * k}..q{i * k + k - 1}" for i in range(num_nodes))
+
+def interpret_multi_qubit_prompt(values):
+    return ", ".join(prompt_graph[node_idx][value] for node_idx, value in enumerate(values))
 
 def run_quantum_prompt():
     qc = build_graph_state_multibit()
-    backend = Aer.get_backend('aer_simulator')
-    tqc = transpile(qc, backend)
-    result = backend.run(tqc, shots=1).result()
-    bitstring = list(result.get_counts().keys())[0]  # e.g. '010110'
-    # print(bitstring)
-
-    # Reverse bitstring for correct qubit order
-    bitstring = bitstring[::-1]
-    return interpret_multi_qubit_prompt(bitstring)
+    # Clifford only: sampled without importing qiskit, so graphs of hundreds of
+    # nodes are fine (QTQC_ENTROPY picks the bits)
+    bits = sample_array(qc, bit_source=configured_source())
+
+    # One k-bit value per node, e.g. (2, 1, 3)
+    values = decode(bits, node_layout(len(prompt_graph)))[0].tolist()
+    return interpret_multi_qubit_prompt(values)
 
 # Run it
 print("Quantum-Coherent Prompt")
@@ -1,5 +1,9 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.entropy import configured_source
+from qtqc.lite import Circuit, sample_array
 
 # Step 1: Define a simple concept graph
 prompt_graph = {
@@ -8,31 +12,28 @@ prompt_graph = {
     2: {0: "Mood: serene",         1: "Mood: chaotic"}
 }
 
-# Step 2: Build a graph state: 3 qubits connected linearly
-def graph_state_circuit():
-    qc = QuantumCircuit(3, 3)
+# Step 2: Build a graph state: one qubit per concept, connected linearly
+def graph_state_circuit(n=len(prompt_graph)):
+    qc = Circuit(n, n)
     # Superposition
-    for i in range(3):
-        qc.h(i)
-    # Entangle with CZ along edges (0-1 and 1-2)
-    qc.cz(0, 1)
-    qc.cz(1, 2)
+    qc.h(range(n))
+    # Entangle with CZ along edges (0-1, 1-2, ...)
+    for i in range(n - 1):
+        qc.cz(i, i + 1)
     # Measure
-    qc.measure([0, 1, 2], [0, 1, 2])
+    qc.measure(range(n), range(n))
     return qc
 
 # Step 3: Execute and interpret
 def run_prompt_engine():
     qc = graph_state_circuit()
-    backend = Aer.get_backend('qasm_simulator')
-    tqc = transpile(qc, backend)
-    result = backend.run(tqc, shots=1).result()
-    bitstring = list(result.get_counts().keys())[0]  # e.g., '101'
+    # H then CZ only: sampled without importing qiskit (QTQC_ENTROPY picks the bits)
+    bits = sample_array(qc, bit_source=configured_source())[0].tolist()  # qubit 0 first, e.g. [1, 0, 1]
 
-    # Interpret bitstring (reverse if needed)
+    # Interpret the bits
     prompt_parts = []
-    for i, bit in enumerate(reversed(bitstring)):
-        prompt_parts.append(prompt_graph[i][int(bit)])
+    for i, bit in enumerate(bits):
+        prompt_parts.append(prompt_graph[i][bit])
 
     final_prompt = ", ".join(prompt_parts)
     return final_prompt
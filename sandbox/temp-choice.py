@@ -1,19 +1,13 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-from qiskit_aer.noise import thermal_relaxation_error, NoiseModel
-from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
+import os
+import sys
 
-# Generate thermal noise model for a given T1, T2, and gate time
-def create_thermal_noise_model(T1, T2, gate_time=100e-9):
-    error = thermal_relaxation_error(T1, T2, gate_time)
-    noise_model = NoiseModel()
-    noise_model.add_all_qubit_quantum_error(error, ['id', 'u1', 'u2', 'u3', 'x', 'h'])
-    return noise_model
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.lite import Circuit
+from qtqc.noise_sweep import distributions, sweep
 
 # Circuit to create equal superposition over 3 qubits => 8 outcomes
 def create_random_choice_circuit():
-    qc = QuantumCircuit(3, 3)
+    qc = Circuit(3, 3)
     qc.h(0)
     qc.h(1)
     qc.h(2)
@@ -31,22 +25,18 @@ settings = {
     "High Temp (T1=5μs)": (5e-6, 4e-6)
 }
 
-backend = Aer.get_backend("qasm_simulator")
 shots = 10000
-results = []
-labels = []
 
-# Run simulation for each temperature setting
-for label, (T1, T2) in settings.items():
-    noise_model = create_thermal_noise_model(T1, T2)
-    qc = create_random_choice_circuit()
-    tqc = transpile(qc, backend)
-    job = backend.run(tqc, noise_model=noise_model, shots=shots)
-    result = job.result()
-    counts = result.get_counts()
-    results.append(dict(counts))
-    labels.append(label)
+# Transpile once and run every setting as one batched job
+qc = create_random_choice_circuit()
+points = [(T1, T2, 100e-9) for T1, T2 in settings.values()]
+table = sweep(qc, points, shots=shots)
+results = distributions(table)
+labels = list(settings)
+
+# Plot results (qiskit's plotting and matplotlib load only here)
+from qiskit.visualization import plot_histogram
+import matplotlib.pyplot as plt
 
-# Plot results
 plot_histogram(results, legend=labels, title="Effect of T1/T2 Decay on 3-Qubit Random Choice")
 plt.show()
@@ -1,16 +1,15 @@
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-from qiskit.quantum_info import DensityMatrix, partial_trace
-from qiskit_aer.noise import thermal_relaxation_error, NoiseModel
+from qiskit.quantum_info import DensityMatrix
 import numpy as np
 import matplotlib.pyplot as plt
+import os
+import sys
 
-# Step 1: Create thermal noise model
-def create_thermal_noise_model(T1, T2, gate_time=100e-9):
-    error = thermal_relaxation_error(T1, T2, gate_time)
-    noise_model = NoiseModel()
-    noise_model.add_all_qubit_quantum_error(error, ['id', 'u1', 'u2', 'u3', 'x', 'h'])
-    return noise_model
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# Step 1: Thermal noise model, shared with the other temp-*.py studies
+from qtqc.noise_sweep import thermal_noise_model
+from qtqc.backends import get_backend
+from qtqc.density import density_sweep, save_columns
 
 # Step 2: Create a 3-qubit superposition circuit
 def create_superposition_circuit():
@@ -26,8 +25,7 @@ def create_superposition_circuit():
 
 # Step 3: Simulate and extract final density matrix
 def simulate_density_matrix(qc, noise_model):
-    backend = Aer.get_backend('aer_simulator')
-    backend.set_options(method='density_matrix')
+    backend = get_backend('density_matrix')
     qc.save_density_matrix()
     tqc = transpile(qc, backend)
     result = backend.run(tqc, noise_model=noise_model).result()
@@ -47,10 +45,24 @@ def plot_density_matrix(dm, title="Density Matrix (real part)"):
 T1, T2 = 5e-6, 4e-6  # "High temperature" setting
 
 # Run everything
-noise_model = create_thermal_noise_model(T1, T2)
+noise_model = thermal_noise_model(T1, T2)
 qc = create_superposition_circuit()
 dm = simulate_density_matrix(qc, noise_model)
 
 # Display
 print("Final Density Matrix (complex):\n", dm)
 plot_density_matrix(dm, title="High Temp: Final Density Matrix (Re)")
+
+# Step 5: Sweep temperature, keeping only each qubit's reduced state
+T1s = np.geomspace(1e-6, 100e-6, 50)
+points = [(T1, 0.8 * T1, 100e-9) for T1 in T1s]
+columns = density_sweep(create_superposition_circuit(), points)
+print("Saved sweep to", save_columns("decohere-sweep.parquet", columns))
+
+fig, ax = plt.subplots(figsize=(8, 5))
+ax.semilogx(T1s, columns["purity_q0"], label="purity Tr(ρ²)")
+ax.semilogx(T1s, columns["l1_q0"], label="l1-coherence")
+ax.set_xlabel("T1 (s), T2 = 0.8·T1")
+ax.set_title("Qubit 0 after idling: coherence returns as temperature drops")
+ax.legend()
+plt.show()
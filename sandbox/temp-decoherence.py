@@ -19,22 +19,16 @@
 # You can’t use this qubit for interference-based algorithms like Grover’s or Shor’s.
 # The quantum behavior is effectively lost — it behaves classically.
 
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
-from qiskit_aer.noise import thermal_relaxation_error, NoiseModel
-from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
+import os
+import sys
 
-# Function to create a noise model for given T1, T2, and gate time
-def create_thermal_noise_model(T1, T2, gate_time=100e-9):
-    error = thermal_relaxation_error(T1, T2, gate_time)
-    noise_model = NoiseModel()
-    noise_model.add_all_qubit_quantum_error(error, ['id', 'u1', 'u2', 'u3', 'x', 'h'])
-    return noise_model
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.lite import Circuit
+from qtqc.noise_sweep import distributions, sweep
 
 # Create a simple circuit to test decoherence
 def create_test_circuit():
-    qc = QuantumCircuit(1, 1)
+    qc = Circuit(1, 1)
     qc.h(0)           # Prepare |+> state
     qc.barrier()
     qc.id(0)          # Idle gate (simulate time passing)
@@ -49,21 +43,18 @@ settings = {
     "High Temp (T1=5us)": (5e-6, 4e-6)
 }
 
-backend = Aer.get_backend("qasm_simulator")
 shots = 2000#1024
-results = []
-labels = []
 
-for label, (T1, T2) in settings.items():
-    noise_model = create_thermal_noise_model(T1, T2)
-    qc = create_test_circuit()
-    tqc = transpile(qc, backend)
-    job = backend.run(tqc, noise_model=noise_model, shots=shots)
-    result = job.result()
-    counts = result.get_counts()
-    results.append(dict(counts))
-    labels.append(label)
+# Transpile once and run every setting as one batched job
+qc = create_test_circuit()
+points = [(T1, T2, 100e-9) for T1, T2 in settings.values()]
+table = sweep(qc, points, shots=shots)
+results = distributions(table)
+labels = list(settings)
+
+# Plot the results (qiskit's plotting and matplotlib load only here)
+from qiskit.visualization import plot_histogram
+import matplotlib.pyplot as plt
 
-# Plot the results
 plot_histogram(results, legend=labels, title="Effect of Increasing Temperature via T1/T2 Reduction")
 plt.show()
@@ -1,7 +1,16 @@
 import cv2
 import numpy as np
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from qtqc.amplitudes import interference_circuit, sample_outcome, sweep_probabilities, weights_for
+from qtqc.blend import Blender
+from qtqc.lite import Circuit, sample
+from qtqc.video import CapturePool, LatencyStats
 
 
 # === File Paths for Videos ===
@@ -12,12 +21,18 @@ video_paths = {
     "11": "video-11.mov",
 }
 
-# === Load all videos ===
-caps = {k: cv2.VideoCapture(video_paths[k]) for k in video_paths}
-fps = caps["00"].get(cv2.CAP_PROP_FPS)
-frame_count = int(caps["00"].get(cv2.CAP_PROP_FRAME_COUNT))
-width = int(caps["00"].get(cv2.CAP_PROP_FRAME_WIDTH))
-height = int(caps["00"].get(cv2.CAP_PROP_FRAME_HEIGHT))
+# Optional decode-once cache: frames are memory-mapped from here instead of
+# decoded during playback (set a directory, and optionally a (width, height))
+frame_cache_dir = None  # e.g. ".frame-cache"
+frame_cache_size = None
+
+# === Open each video exactly once; the pool owns the decoders ===
+stats = LatencyStats()
+pool = CapturePool(video_paths, stats=stats, frame_cache_dir=frame_cache_dir, size=frame_cache_size)
+views = {k: pool.view(k) for k in video_paths}
+fps = pool.sources["00"].fps
+width = pool.sources["00"].width
+height = pool.sources["00"].height
 
 # === Create Window ===
 cv2.namedWindow("Quantum Video", cv2.WINDOW_NORMAL)
@@ -27,162 +42,185 @@ cv2.resizeWindow("Quantum Video", width, height)
 transition_frames = 30
 play_frames = 120
 
-# === Loop the sequence until user presses Escape ===
-while True:
-    # === Qiskit: Generate Quantum Collapse (each loop) ===
-    qc = QuantumCircuit(2, 2)
+# Blend weights: equal 1/4 each, or |amplitude|^2 of a 2-qubit circuit as θ sweeps
+amplitude_sweep = False
+sweep_frames = 240  # frames per full 0..2π turn of θ
+
+# Precompute the whole sweep in one batched statevector pass, not per frame
+# (qiskit is only imported when the sweep is on)
+thetas = np.linspace(0, 2 * np.pi, sweep_frames, endpoint=False)
+circuit = theta = sweep = None
+if amplitude_sweep:
+    circuit = interference_circuit()
+    theta = list(circuit.parameters)[0]
+    sweep = sweep_probabilities(circuit, theta, thetas)
+
+# Composited frames waiting to be shown; small so the display never lags far behind
+ready = queue.Queue(maxsize=4)
+stop = threading.Event()
+
+# Preallocated output ring: queued frames + the one on screen + the one being blended
+blender = Blender((height, width, 3), buffers=ready.maxsize + 3)
+
+
+def measure_outcome(step):
+    if amplitude_sweep:
+        # Collapse the state as it will be when the transition starts
+        return sample_outcome(circuit.assign_parameters({theta: thetas[step % sweep_frames]}))
+    qc = Circuit(2, 2)
     qc.h([0, 1])             # Superposition
     qc.measure([0, 1], [0, 1])
-    backend = Aer.get_backend('qasm_simulator')
-    job = backend.run(qc, shots=1)  # 1 shot to simulate single collapse
-    result = job.result()
-    counts = result.get_counts()
-    outcome = list(result.get_counts().keys())[0]  # e.g. '10'
-    print(f"Measured: {outcome}")
-
-    # Reset all video captures to the first frame
-    for cap in caps.values():
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-    collapsed_cap = cv2.VideoCapture(video_paths[outcome])
-    
+    return sample(qc)[0]     # 1 shot to simulate single collapse, e.g. '10'
+
+
+def read_superposition():
+    frames = [view.read() for view in views.values()]
+    if any(frame is None for frame in frames):
+        return None
+    return frames
+
+
+def source_weights(step):
+    if sweep is None:
+        return [0.25] * 4
+    return weights_for(views, sweep[step % sweep_frames])
+
+
+def superposition_weights(step, collapsed_weight):
+    """Superposition weights sharing what the collapsed stream leaves."""
+    return [(1 - collapsed_weight) * w for w in source_weights(step)] + [collapsed_weight]
+
+
+def present(frame):
+    """Hand a composited frame to the display loop; False once playback stops."""
+    while not stop.is_set():
+        try:
+            ready.put(frame, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def compose_loop():
+    """Compositor stage: measure, pull decoded frames, blend, queue for display."""
+    step = 0  # position in the amplitude sweep
+    while not stop.is_set():
+        # === Qiskit: Generate Quantum Collapse (each loop) ===
+        outcome = measure_outcome(step + play_frames)
+        print(f"Measured: {outcome}")
+
+        # Reset all video streams to the first frame
+        pool.rewind()
+        step = compose_sequence(outcome, step)
+
+
+def compose_sequence(outcome, step):
+    """Compose one measure/collapse cycle; returns the updated sweep position."""
     # === Play through blended superposition ===
-    last_blended = None
     for i in range(play_frames):
-        frames = []
-        for k, cap in caps.items():
-            ret, frame = cap.read()
-            if not ret:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                ret, frame = cap.read()
-            if ret:
-                frame = frame.astype(np.float32)
-                frames.append(frame)
-        if len(frames) == 4:
-            # Blend all four frames equally
-            blended = sum(frames) / 4.0
-            blended = np.clip(blended, 0, 255).astype(np.uint8)
-            last_blended = blended.copy()
-            # Display 'superposition' text for the first second
-            # if i < int(fps):
-            cv2.putText(
-                blended, 'superposition', (30, 60),
-                cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 4, cv2.LINE_AA
-            )
-            cv2.imshow("Quantum Video", blended)
-            key = cv2.waitKey(int(1000 / fps)) & 0xFF
-            if key == 27:  # Escape key
-                for cap in caps.values():
-                    cap.release()
-                collapsed_cap.release()
-                cv2.destroyAllWindows()
-                exit()
-    
-    # === Lerp transition from superposition to collapsed frames (dynamic) ===transition_frames = 30
+        frames = read_superposition()
+        if frames is None:
+            break
+        start = time.perf_counter()
+        # Blend all four frames by their current weights
+        blended = blender.blend(frames, source_weights(step))
+        step += 1
+        stats.add("blend", (time.perf_counter() - start) * 1000)
+        cv2.putText(
+            blended, 'superposition', (30, 60),
+            cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 4, cv2.LINE_AA
+        )
+        if not present(blended):
+            return step
+
+    # The collapsed stream is the outcome's own view: it continues from the
+    # frame the superposition just showed, decoded once for both
+    collapsed_index = list(views).index(outcome)
+
+    # === Lerp transition from superposition to collapsed frames (dynamic) ===
     for i in range(transition_frames):
-        # Read next blended superposition frame
-        frames = []
-        for k, cap in caps.items():
-            ret, frame = cap.read()
-            if not ret:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                ret, frame = cap.read()
-            if ret:
-                frame = frame.astype(np.float32)
-                frames.append(frame)
-        # Read next collapsed frame
-        ret, collapsed_frame = collapsed_cap.read()
-        if not ret:
-            collapsed_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, collapsed_frame = collapsed_cap.read()
-        if not ret or len(frames) != 4:
+        frames = read_superposition()
+        if frames is None:
             break
-        blended = sum(frames) / 4.0
-        blended = np.clip(blended, 0, 255).astype(np.uint8)
-        blended_f = blended.astype(np.float32)
-        collapsed_f = collapsed_frame.astype(np.float32)
+        collapsed_frame = frames[collapsed_index]
+        start = time.perf_counter()
         alpha = (i + 1) / transition_frames
-        frame = (1 - alpha) * blended_f + alpha * collapsed_f
-        frame = np.clip(frame, 0, 255).astype(np.uint8)
+        # One five-way blend instead of blending the superposition and then lerping
+        frame = blender.blend(frames + [collapsed_frame], superposition_weights(step, alpha))
+        step += 1
+        stats.add("blend", (time.perf_counter() - start) * 1000)
         # Display measured outcome text during transition
         cv2.putText(
             frame, f'measured {outcome}', (30, 120),
             cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 4, cv2.LINE_AA
         )
-        cv2.imshow("Quantum Video", frame)
-        key = cv2.waitKey(int(1000 / fps)) & 0xFF
-        if key == 27:
-            for cap in caps.values():
-                cap.release()
-            collapsed_cap.release()
-            cv2.destroyAllWindows()
-            exit()
-
-    # Do not release collapsed_cap; continue to play through it at current location
+        if not present(frame):
+            return step
+
+    # Continue to play through the collapsed stream at its current location
     for i in range(play_frames):
-        ret, frame = collapsed_cap.read()
-        if not ret:
-            collapsed_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = collapsed_cap.read()
-        if not ret:
+        frame = views[outcome].read()
+        if frame is None:
             break
+        # Copy out of the shared decode buffer before drawing on it
+        frame = blender.blend([frame], [1.0])
         # Display 'collapsed' text for the first second
         if i < int(fps):
             cv2.putText(
                 frame, 'collapsed', (30, 60),
                 cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 4, cv2.LINE_AA
             )
-        cv2.imshow("Quantum Video", frame)
-        key = cv2.waitKey(int(1000 / fps)) & 0xFF
-        if key == 27:
-            for cap in caps.values():
-                cap.release()
-            collapsed_cap.release()
-            cv2.destroyAllWindows()
-            exit()
-    
-    # === Lerp transition from collapsed back to superposition (dynamic) ===
-    # Reset all video captures to the first frame for superposition
-    # for cap in caps.values():
-    #     cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-    # collapsed_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if not present(frame):
+            return step
 
-    transition_frames = 30
+    # === Lerp transition from collapsed back to superposition (dynamic) ===
     for i in range(transition_frames):
-        # Read next collapsed frame
-        ret, collapsed_frame = collapsed_cap.read()
-        if not ret:
-            collapsed_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, collapsed_frame = collapsed_cap.read()
-        if not ret:
-            break
-        collapsed_f = collapsed_frame.astype(np.float32)
-
-        # Read next blended superposition frame
-        frames = []
-        for k, cap in caps.items():
-            ret2, frame = cap.read()
-            if not ret2:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                ret2, frame = cap.read()
-            if ret2:
-                frame = frame.astype(np.float32)
-                frames.append(frame)
-        if len(frames) != 4:
+        frames = read_superposition()
+        if frames is None:
             break
-        blended = sum(frames) / 4.0
-        blended = np.clip(blended, 0, 255).astype(np.uint8)
-        blended_f = blended.astype(np.float32)
-
+        collapsed_frame = frames[collapsed_index]
+        start = time.perf_counter()
         # Lerp from collapsed to blended (reverse direction)
         alpha = (i + 1) / transition_frames
-        frame = (1 - alpha) * collapsed_f + alpha * blended_f
-        frame = np.clip(frame, 0, 255).astype(np.uint8)
-        cv2.imshow("Quantum Video", frame)
-        key = cv2.waitKey(int(1000 / fps)) & 0xFF
-        if key == 27:
-            for cap in caps.values():
-                cap.release()
-            collapsed_cap.release()
-            cv2.destroyAllWindows()
-            exit()
-    collapsed_cap.release()
+        frame = blender.blend(frames + [collapsed_frame], superposition_weights(step, 1 - alpha))
+        step += 1
+        stats.add("blend", (time.perf_counter() - start) * 1000)
+        if not present(frame):
+            return step
+    return step
+
+
+compositor = threading.Thread(target=compose_loop, daemon=True, name="compositor")
+compositor.start()
+
+# === Display loop: only presents frames that are already composited ===
+frame_interval = 1.0 / fps
+shown = 0
+last_report = time.perf_counter()
+next_due = time.perf_counter()
+while True:
+    try:
+        frame = ready.get(timeout=1.0)
+    except queue.Empty:
+        continue
+    start = time.perf_counter()
+    cv2.imshow("Quantum Video", frame)
+    stats.add("present", (time.perf_counter() - start) * 1000)
+    shown += 1
+
+    # Wait out the rest of this frame's slot (at least 1 ms so the window updates)
+    next_due = max(next_due + frame_interval, time.perf_counter())
+    key = cv2.waitKey(max(1, int((next_due - time.perf_counter()) * 1000))) & 0xFF
+    if key == 27:  # Escape key
+        break
+
+    now = time.perf_counter()
+    if now - last_report >= 5.0:
+        print(f"{stats.report()} | {shown / (now - last_report):.1f} fps (source {fps:.1f})")
+        shown, last_report = 0, now
+
+stop.set()
+compositor.join()
+pool.close()
+cv2.destroyAllWindows()